@@ -0,0 +1,289 @@
+import heapq
+import time
+
+from alcance import reachable
+from busqueda import SearchStats, drain, index_heuristic, record_frontier, record_path
+from frontera import Frontier
+
+# Búsquedas con memoria acotada, para consultas difíciles en mapas enormes en
+# las que A* y Costo Uniforme podrían quedarse sin memoria: en vez de guardar
+# todo lo visitado, vuelven a expandir nodos. Las estadísticas dejan ver el
+# intercambio: stats.stored es el pico de nodos guardados a la vez y
+# stats.reexpanded cuántas expansiones repitieron un nodo ya expandido.
+#
+#   - IDA* (Korf, 1985): búsqueda en profundidad con un umbral de f que sube
+#     iteración a iteración. Solo guarda el camino actual y una tabla de
+#     transposiciones (celda -> menor g con que se llegó en esta iteración)
+#     que corta las ramas que llegan a una celda por un camino peor. La tabla
+#     es de acceso directo con `table_size` casillas (celda % table_size) y
+#     cada celda nueva pisa a la que estuviera: con una tabla chica se poda
+#     menos, pero siempre con lo más reciente, que es lo que más se repite en
+#     una búsqueda en profundidad. Óptima. Como repite la profundización
+#     hasta agotar el umbral, primero se consulta si la meta es alcanzable.
+#   - SMA* (Russell, 1992): A* que nunca guarda más de `max_nodes` nodos. Si
+#     se llena, olvida la hoja de mayor f y le deja a su padre ese valor, para
+#     volver a generarla si en algún momento es lo mejor que queda. Óptima si
+#     el camino óptimo cabe en la memoria.
+#
+# Las dos aceptan `max_expanded`: al llegar a ese número de expansiones se
+# rinden y devuelven un camino vacío.
+#
+# Para contar reexpansiones se lleva un bit por celda (n / 8 bytes), que solo
+# alimenta la estadística.
+
+TABLA = 1 << 16      # entradas de la tabla de transposiciones de IDA*
+NODOS = 1 << 14      # nodos que SMA* guarda como máximo
+INF = float('inf')
+
+
+def _expandidas(grid):
+    vistas = bytearray((len(grid) + 7) >> 3)
+
+    def repetida(i):
+        byte, bit = i >> 3, 1 << (i & 7)
+        if vistas[byte] & bit:
+            return True
+        vistas[byte] |= bit
+        return False
+    return repetida
+
+
+# --- IDA* con tabla de transposiciones ---
+def iter_ida_star(grid, start, goal, observer=None, step=1, table_size=TABLA,
+                  max_expanded=None):
+    stats = SearchStats('ida_star')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    h = index_heuristic(grid, goal)
+    repetida = _expandidas(grid)
+    stats.stored = 1
+    path = []
+    umbral = h(s)
+    if not reachable(grid, start, goal):
+        return record_path(grid, stats, path, inicio)
+
+    tramo = step
+    agotado = False
+    while s != g:
+        if observer is not None:
+            observer('message', f'Umbral de f: {umbral}')
+        stats.expanded += 1  # cada iteración vuelve a partir del inicio
+        if repetida(s):
+            stats.reexpanded += 1
+        siguiente = INF
+        tabla = {s % table_size: (s, 0)}
+        camino, gs, pila = [s], [0], [iter(moves[mask[s]])]
+        en_camino = {s}
+        while pila:
+            off = next(pila[-1], None)
+            if off is None:
+                pila.pop()
+                en_camino.discard(camino.pop())
+                gs.pop()
+                continue
+            v = camino[-1] + off
+            g_v = gs[-1] + (1 if costs is None else costs[v])
+            f = g_v + h(v)
+            if f > umbral:
+                if f < siguiente:
+                    siguiente = f
+                continue
+            casilla = v % table_size
+            previo = tabla.get(casilla)
+            if (previo is not None and previo[0] == v and previo[1] <= g_v) or v in en_camino:
+                continue  # transposición por un camino no mejor, o ciclo
+            tabla[casilla] = (v, g_v)
+            if max_expanded is not None and stats.expanded >= max_expanded:
+                agotado = True
+                break
+            if tramo:
+                tramo -= 1
+                if not tramo:
+                    tramo = step
+                    yield stats
+            stats.expanded += 1
+            stats.generated += 1
+            if repetida(v):
+                stats.reexpanded += 1
+            if observer is not None:
+                observer('expand', position(v))
+            if v == g:
+                path = [position(i) for i in camino[1:]] + [position(v)]
+                break
+            camino.append(v)
+            gs.append(g_v)
+            pila.append(iter(moves[mask[v]]))
+            en_camino.add(v)
+            if len(camino) > stats.max_frontier:
+                stats.max_frontier = len(camino)
+            if len(tabla) + len(camino) > stats.stored:
+                stats.stored = len(tabla) + len(camino)
+        if path or agotado or siguiente == INF:
+            break
+        umbral = siguiente
+
+    stats.pushes, stats.pops = stats.expanded, stats.expanded
+    return record_path(grid, stats, path, inicio)
+
+
+def ida_star(grid, start, goal, observer=None, table_size=TABLA, max_expanded=None):
+    return drain(iter_ida_star(grid, start, goal, observer, 0, table_size, max_expanded))
+
+
+# --- SMA* ---
+# Como en el SMA* original, los sucesores se generan de a uno: cada vez que un
+# nodo sale de la frontera genera su mejor sucesor pendiente y, si le quedan
+# más, vuelve a entrar con la f del siguiente. Así nunca se ocupa memoria en
+# hermanos peores que lo que ya se está explorando (generarlos todos juntos
+# con la memoria justa hace que se desplacen entre sí sin avanzar). Por eso
+# stats.expanded cuenta salidas de la frontera, y stats.reexpanded las veces
+# que se volvió a expandir una celda que ya se había expandido y olvidado.
+#
+# Cada nodo guardado es [g, f, padre, hijos guardados, pendientes, expandido]:
+# "pendientes" es None o un dict sucesor -> f de los que no están en memoria,
+# porque aún no se generaron o porque se olvidaron; un sucesor olvidado deja
+# ahí la f respaldada de su subárbol, que recupera al regenerarse (si no, se
+# volvería a explorar una y otra vez el mismo subárbol olvidado).
+G, F, PADRE, HIJOS, PENDIENTES, EXPANDIDO = range(6)
+
+
+def iter_sma_star(grid, start, goal, observer=None, step=1, max_nodes=NODOS,
+                  max_expanded=None):
+    if max_nodes < 2:
+        raise ValueError(f'SMA* necesita al menos 2 nodos de memoria: {max_nodes}')
+    stats = SearchStats('sma_star')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    h = index_heuristic(grid, goal)
+    repetida = _expandidas(grid)
+    guardados = {s: [0, h(s), None, 0, None, False]}
+    abiertos = Frontier()
+    push, pop = abiertos.push, abiertos.pop
+    push(s, h(s), 0)
+    hojas = [(-h(s), s)]  # candidatas a olvidar, la de mayor f primero
+    stats.stored = 1
+    llegada = None
+
+    def olvidar():
+        # Suelta la hoja guardada de mayor f; False si no hay ninguna
+        while hojas:
+            menos_f, u = heapq.heappop(hojas)
+            nodo = guardados.get(u)
+            if nodo is None or u == s or nodo[HIJOS] or -menos_f != nodo[F]:
+                continue  # entrada vieja, o nodo que no se puede soltar
+            del guardados[u]
+            abiertos.remove(u)
+            # Un nodo ya expandido vale lo mejor que le quedaba pendiente
+            # (infinito si no tenía salida); uno sin expandir, su propia f
+            if nodo[EXPANDIDO]:
+                valor = min(nodo[PENDIENTES].values()) if nodo[PENDIENTES] else INF
+            else:
+                valor = nodo[F]
+            padre = guardados[nodo[PADRE]]
+            padre[HIJOS] -= 1
+            if valor < INF:
+                pendientes = padre[PENDIENTES]
+                if pendientes is None:
+                    pendientes = padre[PENDIENTES] = {}
+                antes = min(pendientes.values(), default=INF)
+                pendientes[u] = valor
+                if valor < antes:
+                    push(nodo[PADRE], valor, padre[G])
+            if not padre[HIJOS]:
+                heapq.heappush(hojas, (-padre[F], nodo[PADRE]))
+            return True
+        return False
+
+    tramo = step
+    while abiertos:
+        if max_expanded is not None and stats.expanded >= max_expanded:
+            break
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        u, _ = pop()
+        nodo = guardados[u]
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(u))
+        if u == g:
+            llegada = u
+            break
+
+        if not nodo[EXPANDIDO]:
+            nodo[EXPANDIDO] = True
+            if repetida(u):
+                stats.reexpanded += 1
+            # Sin pathmax desde el padre: la heurística ya es consistente, y la f
+            # respaldada de un nodo no acota a los sucesores que comparte con
+            # otras ramas por transposición
+            nodo[PENDIENTES] = {
+                u + off: nodo[G] + (1 if costs is None else costs[u + off]) + h(u + off)
+                for off in moves[mask[u]]}
+        pendientes = nodo[PENDIENTES]
+        # El mejor sucesor pendiente que no esté ya guardado por un camino mejor
+        while pendientes:
+            v = min(pendientes, key=pendientes.get)
+            f_v = pendientes.pop(v)
+            g_v = nodo[G] + (1 if costs is None else costs[v])
+            previo = guardados.get(v)
+            if previo is None or g_v < previo[G]:
+                break
+        else:
+            v = None
+
+        if v is not None:
+            nodo[HIJOS] += 1  # protege a u de olvidar() mientras hace lugar
+            if previo is None:
+                while len(guardados) >= max_nodes and olvidar():
+                    pass
+                if len(guardados) < max_nodes:
+                    guardados[v] = [g_v, f_v, u, 0, None, False]
+                else:
+                    # Todo lo guardado es camino (no hay hojas que soltar): como
+                    # en SMA*, este sucesor queda fuera de alcance con esta memoria
+                    nodo[HIJOS] -= 1
+                    v = None
+            else:
+                viejo = guardados.get(previo[PADRE])
+                if viejo is not None:
+                    viejo[HIJOS] -= 1
+                    if not viejo[HIJOS]:
+                        heapq.heappush(hojas, (-viejo[F], previo[PADRE]))
+                previo[G], previo[F], previo[PADRE] = g_v, f_v, u
+                previo[PENDIENTES] = None
+                previo[EXPANDIDO] = False
+        if v is not None:
+            push(v, f_v, g_v)
+            if not guardados[v][HIJOS]:
+                heapq.heappush(hojas, (-f_v, v))
+            stats.generated += 1
+            if observer is not None:
+                observer('visit', position(v))
+        if nodo[PENDIENTES]:
+            push(u, min(nodo[PENDIENTES].values()), nodo[G])
+        if not nodo[HIJOS]:
+            heapq.heappush(hojas, (-nodo[F], u))
+        if len(guardados) > stats.stored:
+            stats.stored = len(guardados)
+        if len(abiertos) > stats.max_frontier:
+            stats.max_frontier = len(abiertos)
+
+    record_frontier(stats, abiertos)
+    path = []
+    current = llegada
+    while current is not None and current != s:
+        path.append(position(current))
+        current = guardados[current][PADRE]
+    path.reverse()
+    return record_path(grid, stats, path, inicio)
+
+
+def sma_star(grid, start, goal, observer=None, max_nodes=NODOS, max_expanded=None):
+    return drain(iter_sma_star(grid, start, goal, observer, 0, max_nodes, max_expanded))
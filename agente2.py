@@ -1,14 +1,22 @@
-import pygame
 import sys
 import random
-import heapq
-from collections import deque
-import json
 import time
-import matplotlib.pyplot as plt
+
+import estrategias
+import traza
+from binario import load_maze
+from grid import Grid
+from planificador import Scheduler
+
+# pygame (y render, que lo usa) se importan al abrir la ventana en main(), y
+# matplotlib solo al pedir la gráfica de tiempos (tecla T): importar este
+# módulo, o usar el núcleo de búsqueda desde un script, no carga nada gráfico
+pygame = None
+render = None
 
 # === Configuración ===
 TILE_SIZE = 150
+FPS = 30
 ROWS, COLS = 4,4
 EMPTY, OBSTACLE, START, GOAL = 0, 1, 2, 3
 AGENTE_COLOR = 4
@@ -34,280 +42,212 @@ COLORS = {
     'visited': (100, 149, 237),   # azul claro (explorado)
     'path': (255, 255, 0)         # amarillo (camino)
 }
+# Terreno: click derecho recorre estos costos; el color se oscurece con el costo
+COSTOS_TERRENO = (1, 2, 4, 8)
+COLOR_TERRENO = (150, 111, 51)    # café (terreno más caro)
 
 # Variables globales
 start = (0, 0)       # Posición inicial por defecto
 goal = (ROWS - 1, COLS - 1)  # Posición objetivo por defecto
-maze = []
-
-# --- Funciones auxiliares ---
-def get_neighbors(pos):
-    x, y = pos
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < ROWS and 0 <= ny < COLS and maze[nx][ny] != 1:
-            yield (nx, ny)
-
-def manhattan(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-def reconstruct_path(came_from, start, goal):
-    current = goal
-    path = []
-    while current != start:
-        path.append(current)
-        current = came_from.get(current)
-        if current is None:
-            return []
-    path.reverse()
-    return path
+maze = Grid(ROWS, COLS)
+ultima_duracion = 0.0  # segundos de la última búsqueda, sin animación
+
+# Animación: milisegundos entre pasos de la búsqueda (teclas +/-) y del ratón
+velocidad = 50
+VELOCIDAD_MAX = 800
+INTERVALO_AGENTE = 0.2
+PASOS_SIN_PAUSA = 256         # expansiones por paso cuando la velocidad es 0
+PRESUPUESTO_CUADRO = 0.6 / FPS  # segundos por cuadro para avanzar tareas
+planificador = Scheduler()
+
+# Estrategias adicionales del registro (clave, nombre mostrado)
+ESTRATEGIAS_EXTRA = [
+    ('dstar', "D* Lite"),
+    ('jps', "Jump Point Search"),
+    ('bibfs', "BFS Bidireccional"),
+    ('biastar', "A* Bidireccional"),
+    ('distfield', "Campo de Distancias"),
+    ('dial', "Dijkstra con Cubetas"),
+    ('hpa', "HPA* Jerárquico"),
+    ('multibfs', "Meta más cercana (BFS)"),
+    ('multiastar', "A* Multi-meta"),
+    ('arastar', "ARA* (anytime)"),
+    ('idastar', "IDA* (memoria acotada)"),
+    ('smastar', "SMA* (memoria acotada)"),
+]
+extra_actual = 0
+
+# Estado de lo que hay dibujado en pantalla, para repintar solo lo que cambia
+pintado = {}            # celda -> tipo con el que se dibujó por última vez
+pendientes = set()      # celdas a revisar en el próximo draw_maze
+camino_previo = set()
+agente_previo = None
+sidebar_previo = None   # contenido del sidebar en el último dibujo
+ultimas_stats = None    # SearchStats de la última búsqueda (gancho de estrategias)
+ultima_traza = None     # traza.Trace de la última búsqueda (tecla W la guarda)
+tarea_busqueda = None   # Task del planificador de la búsqueda en curso
+MAX_MENSAJES = 6        # mensajes visibles bajo las estadísticas
 
 # --- Búsquedas ---
-def bfs(start, goal, screen):
-    queue = deque([start])
-    came_from = {start: None}
-
-    while queue:
-        pygame.time.delay(50)  # pausa para animar
-        current = queue.popleft()
-
-        if current == goal:
-            break
-
-        for neighbor in get_neighbors(current):
-            if neighbor not in came_from:
-                queue.append(neighbor)
-                came_from[neighbor] = current
-
-                # marcar explorado
-                if maze[neighbor[0]][neighbor[1]] not in [2, 3]:
-                    draw_tile(screen, neighbor, 'visited')
-        pygame.display.flip()
-
-    return reconstruct_path(came_from, start, goal)
-
-def dfs(start, goal, screen):
-    stack = [start]
-    came_from = {start: None}
-
-    while stack:
-        pygame.time.delay(50)  # pausa para animar
-        current = stack.pop()
-
-        if current == goal:
-            break
-
-        for neighbor in get_neighbors(current):
-            if neighbor not in came_from:
-                stack.append(neighbor)
-                came_from[neighbor] = current
-
-                # marcar explorado
-                if maze[neighbor[0]][neighbor[1]] not in [2, 3]:
-                    draw_tile(screen, neighbor, 'visited')
-        pygame.display.flip()
-
-    return reconstruct_path(came_from, start, goal)
-
-def a_star(start, goal, screen):
-    frontier = []
+# Los algoritmos viven en busqueda.py y no dependen de pygame; aquí solo se
+# conectan con la ventana mediante un observador que pinta cada expansión.
+# Las búsquedas corren como generadores dentro del planificador, que las
+# avanza un paso cada `velocidad` ms sin bloquear el bucle de eventos.
+def observador_pygame(screen):
+    def observer(evento, dato):
+        inicio = time.perf_counter()
+        if evento == 'visit':
+            # marcar explorado
+            if maze.cell(dato) not in [2, 3]:
+                draw_tile(screen, dato, 'visited')
+        elif evento == 'message':
+            almacenamiento_mensajes(dato)
+        observer.pausa += time.perf_counter() - inicio
+    observer.pausa = 0.0  # tiempo gastado dibujando
+    return observer
+
+
+def al_ritmo(pasos):
+    # Envuelve una búsqueda que cede en cada expansión: cede al planificador
+    # cada 1 expansión, o cada PASOS_SIN_PAUSA con velocidad 0. La velocidad
+    # se relee en cada paso, así que +/- también afecta a la búsqueda en curso
+    hechos = 0
+    try:
+        while True:
+            next(pasos)
+            hechos += 1
+            if hechos >= (1 if velocidad else PASOS_SIN_PAUSA):
+                hechos = 0
+                yield
+    except StopIteration as fin:
+        return fin.value
+    finally:
+        pasos.close()
+
+
+def ajustar_velocidad():
+    # Aplica `velocidad` a la búsqueda en curso (el intervalo de la tarea)
+    if tarea_busqueda is not None and not tarea_busqueda.done:
+        tarea_busqueda.interval = velocidad / 1000
+
+def lanzar_busqueda(screen, clave, nombre, al_terminar):
+    global tarea_busqueda
     mensajes.clear()
-    draw_sidebar(screen)
-    iteraciones = 0
-    heapq.heappush(frontier, (0, start))
-    came_from = {start: None}
-    cost_so_far = {start: 0}
-
-    while frontier:
-        pygame.time.delay(50)  # pausa para animar
-        _, current = heapq.heappop(frontier)
-
-        if current == goal:
-            break
-
-        for neighbor in get_neighbors(current):
-            new_cost = cost_so_far[current] + 1
-            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                cost_so_far[neighbor] = new_cost
-                heuristica = manhattan(neighbor, goal)
-                priority = new_cost + heuristica
-                heapq.heappush(frontier, (priority, neighbor))
-                came_from[neighbor] = current
-
-                # marcar explorado
-                if maze[neighbor[0]][neighbor[1]] not in [2, 3]:
-                    draw_tile(screen, neighbor, 'visited')
-        pygame.display.flip()
-    mensajes.append(f'f({iteraciones+1}): {new_cost} + {heuristica} = {priority}')
-    iteraciones += 1
-
-    return reconstruct_path(came_from, start, goal)
+    observer = observador_pygame(screen)
+    # Mientras se anima se graba la traza, para revisarla luego en reproductor.py
+    grabadora = traza.Recorder(maze, observer)
+    pasos = al_ritmo(estrategias.iter_solve(maze, start, goal, clave, grabadora, 1))
+
+    def terminar(task):
+        global ultima_duracion, ultima_traza
+        path, stats = task.result
+        ultima_traza = grabadora.trace(maze, start, goal, clave, path, stats)
+        # Duración de la búsqueda sin contar el dibujo (para la gráfica T)
+        ultima_duracion = max(task.busy - observer.pausa, 0.0)
+        al_terminar(nombre, path)
+    tarea_busqueda = planificador.spawn(pasos, velocidad / 1000, terminar)
+    return tarea_busqueda
 
 #Dibuja el laberinto
+def color_terreno(costo):
+    t = min(costo - 1, COSTOS_TERRENO[-1] - 1) / (COSTOS_TERRENO[-1] - 1)
+    return tuple(round(a + (b - a) * t) for a, b in zip(COLORS[0], COLOR_TERRENO))
+
 def draw_tile(screen, pos, cell_type):
-    color = COLORS[cell_type] if isinstance(cell_type, int) else COLORS[cell_type]
-    pygame.draw.rect(screen, color, (pos[1] * TILE_SIZE, pos[0] * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-    pygame.draw.rect(screen, (79, 93, 98), (pos[1] * TILE_SIZE, pos[0] * TILE_SIZE, TILE_SIZE, TILE_SIZE), 2)
+    # cell_type: tipo de celda, 'visited', 'path' o ('terrain', costo)
+    terreno = isinstance(cell_type, tuple)
+    color = color_terreno(cell_type[1]) if terreno else COLORS[cell_type]
+    rect = (pos[1] * TILE_SIZE, pos[0] * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    pygame.draw.rect(screen, color, rect)
+    pygame.draw.rect(screen, (79, 93, 98), rect, 2)
+    if terreno:
+        screen.blit(render.text(str(cell_type[1]), 30), (rect[0] + 10, rect[1] + 5))
+    render.mark(rect)
+    pintado[pos] = cell_type
+    if cell_type == 'visited':
+        pendientes.add(pos)  # el próximo draw_maze la devuelve a su estado
+
+def marcar_celda(index, antes, nuevo):
+    # Suscrito al grid: cualquier celda modificada se revisa al dibujar
+    pendientes.add(maze.position(index))
+
+def reiniciar_pintado():
+    pintado.clear()
+    camino_previo.clear()
+    pendientes.update((i, j) for i in range(ROWS) for j in range(COLS))
 
 def draw_maze(screen, path=None, agente_pos=None):
-    for i in range(ROWS):
-        for j in range(COLS):
-            draw_tile(screen, (i, j), maze[i][j])
-    if path:
-        for pos in path:
-            if maze[pos[0]][pos[1]] not in [2, 3]:
-                draw_tile(screen, pos, 'path')
-    if agente_pos:
+    # Solo se revisan las celdas que pudieron cambiar: las modificadas en el
+    # grid, las marcadas como exploradas y las del camino anterior y actual
+    global agente_previo
+    path_set = set(path) if path else set()
+    revisar = pendientes | camino_previo | path_set
+    forzar = set()
+    if agente_pos != agente_previo:
+        forzar = {agente_previo, agente_pos} - {None}
+        revisar |= forzar
+    for pos in revisar:
+        tipo = maze.cell(pos)
+        if pos in path_set and tipo not in [2, 3]:
+            tipo = 'path'
+        elif tipo == EMPTY and maze.cost(maze.index(pos)) > 1:
+            tipo = ('terrain', maze.cost(maze.index(pos)))
+        if pintado.get(pos) != tipo or pos in forzar:
+            draw_tile(screen, pos, tipo)
+    pendientes.clear()
+    camino_previo.clear()
+    camino_previo.update(path_set)
+    if agente_pos and agente_pos in forzar:
         # dibujar agente como círculo
         x, y = agente_pos
         center = (y * TILE_SIZE + TILE_SIZE // 2, x * TILE_SIZE + TILE_SIZE // 2)
         radius = TILE_SIZE // 3
         pygame.draw.circle(screen, AGENTE_COLOR, center, radius)
-    pygame.display.flip()
+    agente_previo = agente_pos
+    render.flush()
 
 # --- Animación del agente ---
-def animate_agente(screen, path):
-    agente_pos = path[0]
-    for pos in path[1:]:
-        agente_pos = pos
-        draw_maze(screen, path, agente_pos)
-        pygame.time.delay(200)
-    return agente_pos
+def pasos_agente(path, mover):
+    # Generador para el planificador: un paso del ratón por intervalo
+    for pos in path:
+        mover(pos)
+        yield
 
 # --- Cargar configuración desde archivo JSON ---
 def load_maze_from_file(filename):
     global ROWS, COLS, start, goal, maze
     try:
-        with open(filename, 'r') as file:
-            config = json.load(file)
-        
-        ROWS, COLS = config['rows'], config['cols']
-        start = tuple(config['start'])
-        goal = tuple(config['goal'])
-        
-        # Inicializar el laberinto
-        maze = [[0 for _ in range(COLS)] for _ in range(ROWS)]
-        maze[start[0]][start[1]] = 2  # START
-        maze[goal[0]][goal[1]] = 3    # GOAL
-        
-        # Agregar obstáculos
-        for obstacle in config.get('obstacles', []):
-            row, col = obstacle
-            maze[row][col] = 1  # OBSTACLE
+        maze, start, goal = load_maze(filename)
+        ROWS, COLS = maze.rows, maze.cols
+        maze.subscribe(marcar_celda)
+        reiniciar_pintado()
     except Exception as e:
         almacenamiento_mensajes(f"Error al cargar el archivo de configuración: {e}")
         sys.exit()
 
-# --- Búsqueda por Costo Uniforme ---
-def uniform_cost_search(start, goal, screen):
-    frontier = []
-    mensajes.clear()
-    draw_sidebar(screen)
-    heapq.heappush(frontier, (0, start))  # (costo, posición)
-    came_from = {start: None}
-    cost_so_far = {start: 0}
-    iteraciones = 0
-    
-    while frontier:
-        pygame.time.delay(50)  # pausa para animar
-        current_cost, current = heapq.heappop(frontier)
-
-        if current == goal:
-            break
-
-        for neighbor in get_neighbors(current):
-            new_cost = cost_so_far[current] + 1  # costo uniforme: cada paso tiene costo 1
-            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                cost_so_far[neighbor] = new_cost
-                priority = new_cost  # Prioridad es solo el costo acumulado
-                heapq.heappush(frontier, (priority, neighbor))
-                came_from[neighbor] = current
-                # marcar explorado
-                if maze[neighbor[0]][neighbor[1]] not in [2, 3]:
-                    draw_tile(screen, neighbor, 'visited')
-        pygame.display.flip()
-        mensajes.append(f'El costo total g({iteraciones+1}): {new_cost}')
-        iteraciones += 1
-    return reconstruct_path(came_from, start, goal)
-
-
-# --- Búsqueda Avara ---
-def greedy_best_first_search(start, goal, screen):
-    frontier = []
-    mensajes.clear()
-    draw_sidebar(screen)
-    iteraciones = 0
-    heapq.heappush(frontier, (manhattan(start, goal), start))  # (heurística, posición)
-    came_from = {start: None}
-
-    while frontier:
-        pygame.time.delay(50)  # pausa para animar
-        _, current = heapq.heappop(frontier)
-
-        if current == goal:
-            break
-
-        for neighbor in get_neighbors(current):
-            if neighbor not in came_from:
-                priority = manhattan(neighbor, goal)  # Solo usa la heurística
-                heapq.heappush(frontier, (priority, neighbor))
-                came_from[neighbor] = current
-                # marcar explorado
-                if maze[neighbor[0]][neighbor[1]] not in [2, 3]:
-                    draw_tile(screen, neighbor, 'visited')
-        pygame.display.flip()
-        mensajes.append(f'H({iteraciones+1}): {priority}')
-        iteraciones += 1
-
-    return reconstruct_path(came_from, start, goal)
-
-
-# --- Búsqueda Híbrida Actualizada ---
-def hybrid_search(start, goal, screen):
-    mensajes.clear()
-    draw_sidebar(screen)
-    almacenamiento_mensajes("Intentando BFS...")
-    path = bfs(start, goal, screen)
-    if path:
-        almacenamiento_mensajes("Ruta encontrada con BFS.")
-        return path
-
-    almacenamiento_mensajes("- BFS falló. Intentando A*...")
-    path = a_star(start, goal, screen)
-    if path:
-        almacenamiento_mensajes("- Ruta encontrada con A*.")
-        return path
-
-    almacenamiento_mensajes("- A* falló. Intentando Búsqueda por Costo Uniforme...")
-    path = uniform_cost_search(start, goal, screen)
-    if path:
-        almacenamiento_mensajes(":) Ruta encontrada con Búsqueda por Costo Uniforme.")
-        return path
-
-    almacenamiento_mensajes("- Costo Uniforme falló. Intentando Búsqueda Avara...")
-    path = greedy_best_first_search(start, goal, screen)
-    if path:
-        almacenamiento_mensajes(":) Ruta encontrada con Búsqueda Avara.")
-        return path
-
-    almacenamiento_mensajes("- Búsqueda Avara falló. Intentando DFS...")
-    path = dfs(start, goal, screen)
-    if path:
-        almacenamiento_mensajes(":) Ruta encontrada con DFS.")
-        return path
-
-    almacenamiento_mensajes(":( No se encontró una ruta válida con ninguna técnica.")
-    return None
-
-
 def almacenamiento_mensajes(mensaje):
     mensajes.append(mensaje)
 
+def registrar_stats(evento, dato):
+    # Gancho de estrategias: guarda las estadísticas para la barra lateral
+    global ultimas_stats
+    if evento == 'finish':
+        ultimas_stats = dato
+
+def lineas_stats():
+    if ultimas_stats is None:
+        return []
+    st = ultimas_stats
+    return [
+        f"Expandidos: {st.expanded}  Generados: {st.generated}",
+        f"Push/Pop: {st.pushes}/{st.pops}  Obsoletos: {st.stale_pops}",
+        f"Frontera máx: {st.max_frontier}  Costo: {st.path_cost}",
+    ] + ([f"Cota: a lo sumo x{st.bound:.2f} del óptimo"] if st.bound is not None else [])
+
 # --- Actualización del Sidebar ---
 def draw_sidebar(screen):
+    global sidebar_previo
     sidebar_width = 400
-    pygame.draw.rect(screen, (192, 227, 237), (COLS * TILE_SIZE, 0, sidebar_width, ROWS * TILE_SIZE + 20))
-    font = pygame.font.SysFont("Comic Sans", 17)
     instructions = [
         "1: BFS",
         "2: DFS",
@@ -319,12 +259,25 @@ def draw_sidebar(screen):
         "M: Mover Meta",
         "S: Establecer Inicio",
         "G: Establecer Objetivo",
-        "T: Tiempos de Ejecución"
-        "Click: Agregar/Quitar Obstáculo"
+        "T: Tiempos de Ejecución, W: Guardar traza",
+        "Click: Agregar/Quitar Obstáculo",
+        "Click derecho: Costo del terreno",
+        "A: Cambiar estrategia extra",
+        f"E: Ejecutar {ESTRATEGIAS_EXTRA[extra_actual][1]}",
+        f"+/-: Velocidad ({velocidad} ms por paso), Esc: Detener",
     ]
+    # Estadísticas de la última búsqueda y los mensajes más recientes
+    lineas = lineas_stats() + mensajes[-MAX_MENSAJES:]
+    # Si no cambió nada desde el último dibujo no hay nada que repintar
+    contenido = (tuple(instructions), tuple(lineas))
+    if contenido == sidebar_previo:
+        return
+    sidebar_previo = contenido
+
+    sidebar = (COLS * TILE_SIZE, 0, sidebar_width, ROWS * TILE_SIZE + 20)
+    pygame.draw.rect(screen, (192, 227, 237), sidebar)
     for i, text in enumerate(instructions):
-        img = font.render(text, True, (0, 0, 0))
-        screen.blit(img, (COLS * TILE_SIZE + 10, 10 + i * 35))
+        screen.blit(render.text(text), (COLS * TILE_SIZE + 10, 10 + i * 24))
 
     #Area donde muestra los mensajes, cuando cambia de un algoritmo a otro
     area_x = COLS * TILE_SIZE + 10
@@ -333,15 +286,17 @@ def draw_sidebar(screen):
     area_altura = 200
     
     pygame.draw.rect(screen, (255, 255, 255), (area_x, area_y, area_ancho, area_altura),0,20)
-    font = pygame.font.SysFont("Comic Sans", 17)
 
-    for i, mensj in enumerate(mensajes):
-        img = font.render(mensj, True, (0, 0, 0))
-        screen.blit(img, (area_x + 5, area_y+5 + i *20))
+    for i, mensj in enumerate(lineas):
+        screen.blit(render.text(mensj), (area_x + 5, area_y+5 + i *20))
+    render.mark(sidebar)
     
 def main():
+    global ROWS, COLS, start, goal, maze, extra_actual, velocidad, pygame, render
+    import pygame
+    import render
     pygame.init()
-    global ROWS, COLS, start, goal, maze
+    estrategias.add_hook(registrar_stats)
     # Cargar configuración inicial
     load_maze_from_file("maze_config.json")
     screen = pygame.display.set_mode((COLS * TILE_SIZE + 400, ROWS * TILE_SIZE+10))
@@ -349,86 +304,97 @@ def main():
     running = True
     path = []
     agente_pos = start
+    buscando = False  # mientras corre una búsqueda no se redibuja el laberinto
     
     #Datos grafica
     nombres_algt = []
     tiempos = []
 
+    # Tecla -> (estrategia, nombre mostrado)
+    algoritmos = {
+        pygame.K_1: ('bfs', "BFS"),
+        pygame.K_2: ('dfs', "DFS"),
+        pygame.K_3: ('astar', "A*"),
+        pygame.K_4: ('ucs', "Costo Uniforme"),
+        pygame.K_5: ('greedy', "Búsqueda Avara"),
+        pygame.K_h: ('hybrid', "Búsqueda Híbrida"),
+    }
+
+    def mover_agente(pos):
+        nonlocal agente_pos
+        agente_pos = pos
+
+    def al_terminar(nombre, nuevo_camino):
+        nonlocal path, buscando
+        buscando = False
+        nombres_algt.append(nombre)
+        tiempos.append(ultima_duracion)
+        path = nuevo_camino
+        if path:
+            almacenamiento_mensajes(f"Costo del camino: {maze.path_cost(path)}")
+            planificador.spawn(pasos_agente(path, mover_agente), INTERVALO_AGENTE)
+        else:
+            almacenamiento_mensajes(f"No se encontró una ruta válida con {nombre}.")
+
+    def buscar(clave, nombre):
+        nonlocal path, buscando
+        detener()
+        path = []
+        draw_maze(screen, path, agente_pos)  # limpia el camino anterior
+        buscando = True
+        lanzar_busqueda(screen, clave, nombre, al_terminar)
+
+    def detener():
+        nonlocal buscando
+        planificador.cancel_all()
+        buscando = False
+
+    # Sin cambios, cada vuelta solo revisa eventos y duerme hasta el próximo
+    # cuadro: la ventana queda prácticamente en 0% de CPU mientras espera.
+    # Las búsquedas y la animación avanzan dentro del presupuesto del cuadro.
+    reloj = pygame.time.Clock()
+
     while running:
-        draw_maze(screen, path, agente_pos)
+        planificador.run(PRESUPUESTO_CUADRO)
+        if not buscando:
+            draw_maze(screen, path, agente_pos)
         draw_sidebar(screen)
+        render.flush()
+        reloj.tick(FPS)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif pygame.mouse.get_pressed()[0]:  # Click izquierdo
                 x, y = pygame.mouse.get_pos()
                 row, col = y // TILE_SIZE, x // TILE_SIZE
-                if (row, col) not in [start, goal]:
-                    maze[row][col] = 1 if maze[row][col] == 0 else 0
+                if (not buscando and maze.in_bounds((row, col))
+                        and (row, col) not in [start, goal]):
+                    maze.set_cell((row, col), 1 if maze.cell((row, col)) == 0 else 0)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+                # Click derecho: siguiente costo de terreno de la celda
+                x, y = event.pos
+                row, col = y // TILE_SIZE, x // TILE_SIZE
+                if not buscando and maze.in_bounds((row, col)):
+                    actual = maze.cost(maze.index((row, col)))
+                    siguiente = [c for c in COSTOS_TERRENO if c > actual]
+                    maze.set_cost((row, col), siguiente[0] if siguiente else COSTOS_TERRENO[0])
             elif event.type == pygame.KEYDOWN:
-
-                def mide_tiempo(algoritmo, nombre):
-                    
-                    inicio = time.time()
-                    path = algoritmo(start, goal, screen)
-                    tiempo = time.time() - inicio
-                    nombres_algt.append(nombre)
-                    tiempos.append(tiempo)
-                    if path:
-                        animate_agente(screen, path)
-                    else:
-                        almacenamiento_mensajes(f"No se encontró una ruta válida con {nombre}.")
-
-                if event.key == pygame.K_1:  # BFS
-                    mensajes.clear()
-                    draw_sidebar(screen)
-                    path = bfs(start, goal, screen)
-                    mide_tiempo(bfs,"BFS")
-                    if path:
-                        agente_pos = animate_agente(screen, path)
-                    else:
-                        almacenamiento_mensajes("No se encontró una ruta válida con BFS.")
-                elif event.key == pygame.K_2:  # DFS
-                    draw_sidebar(screen)
-                    mide_tiempo(dfs,"DFS")
-                    path = dfs(start, goal, screen)
-                    if path:
-                        agente_pos = animate_agente(screen, path)
-                    else:
-                        almacenamiento_mensajes("No se encontró una ruta válida con DFS.")
-                elif event.key == pygame.K_3:  # A*
-                    draw_sidebar(screen)
-                    mide_tiempo(dfs,"A*")
-                    path = a_star(start, goal, screen)
-                    if path:
-                        agente_pos = animate_agente(screen, path)
-                    else:
-                        almacenamiento_mensajes("No se encontró una ruta válida con A*.")
-                elif event.key == pygame.K_4:  # Costo Uniforme
-                    draw_sidebar(screen)
-                    mide_tiempo(dfs,"Costo Uniforme")
-                    path = uniform_cost_search(start, goal, screen)
-                    if path:
-                        agente_pos = animate_agente(screen, path)
-                    else:
-                        almacenamiento_mensajes("No se encontró una ruta válida con Costo Uniforme.")
-                elif event.key == pygame.K_5:  # Búsqueda Avara
-                    draw_sidebar(screen)
-                    mide_tiempo(dfs,"Búsqueda Avara")
-                    path = greedy_best_first_search(start, goal, screen)
-                    if path:
-                        agente_pos = animate_agente(screen, path)
-                    else:
-                        almacenamiento_mensajes("No se encontró una ruta válida con Búsqueda Avara.")
-                elif event.key == pygame.K_h:  # Búsqueda híbrida
-                    draw_sidebar(screen)
-                    mide_tiempo(dfs,"Busqueda Hibrida")
-                    path = hybrid_search(start, goal, screen)
-                    if path:
-                        agente_pos = animate_agente(screen, path)
-                    else:
-                        almacenamiento_mensajes("No se encontró una ruta válida con la búsqueda híbrida.")
+                if event.key in algoritmos:
+                    buscar(*algoritmos[event.key])
+                elif event.key == pygame.K_a:  # Siguiente estrategia extra
+                    extra_actual = (extra_actual + 1) % len(ESTRATEGIAS_EXTRA)
+                elif event.key == pygame.K_e:  # Ejecutar estrategia extra
+                    buscar(*ESTRATEGIAS_EXTRA[extra_actual])
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    velocidad //= 2  # más rápido (hasta 0: sin pausa)
+                    ajustar_velocidad()
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    velocidad = min(max(velocidad * 2, 1), VELOCIDAD_MAX)
+                    ajustar_velocidad()
+                elif event.key == pygame.K_ESCAPE:
+                    detener()
                 elif event.key == pygame.K_r:  # Reiniciar
+                    detener()
                     nombres_algt.clear()
                     tiempos.clear()
                     mensajes.clear()
@@ -436,41 +402,50 @@ def main():
                     path = []
                     agente_pos = start
                 elif event.key == pygame.K_m:  # Mover meta
+                    detener()
                     nombres_algt.clear()
                     tiempos.clear()
                     mensajes.clear()
-                    maze[goal[0]][goal[1]] = 0  # Limpiar la antigua posición
+                    maze.set_cell(goal, 0)  # Limpiar la antigua posición
                     new_goal = (random.randint(0, ROWS - 1), random.randint(0, COLS - 1))
                     goal = new_goal
-                    maze[goal[0]][goal[1]] = 3  # Establecer nueva posición
+                    maze.set_cell(goal, 3)  # Establecer nueva posición
                 elif event.key == pygame.K_s:  # Establecer nueva posición de inicio
+                    detener()
                     nombres_algt.clear()
                     tiempos.clear()
                     mensajes.clear()
                     x, y = pygame.mouse.get_pos()
                     row, col = y // TILE_SIZE, x // TILE_SIZE
-                    if (row, col) != goal:
-                        maze[start[0]][start[1]] = 0  # Limpiar la antigua posición
+                    if maze.in_bounds((row, col)) and (row, col) != goal:
+                        maze.set_cell(start, 0)  # Limpiar la antigua posición
                         start = (row, col)
-                        maze[start[0]][start[1]] = 2  # Establecer nueva posición
+                        maze.set_cell(start, 2)  # Establecer nueva posición
                         agente_pos = start
                 elif event.key == pygame.K_g:  # Establecer nueva posición de objetivo
+                    detener()
                     nombres_algt.clear()
                     tiempos.clear()
                     mensajes.clear()
                     x, y = pygame.mouse.get_pos()
                     row, col = y // TILE_SIZE, x // TILE_SIZE
-                    if (row, col) != start:
-                        maze[goal[0]][goal[1]] = 0  # Limpiar la antigua posición
+                    if maze.in_bounds((row, col)) and (row, col) != start:
+                        maze.set_cell(goal, 0)  # Limpiar la antigua posición
                         goal = (row, col)
-                        maze[goal[0]][goal[1]] = 3  # Establecer nueva posición
+                        maze.set_cell(goal, 3)  # Establecer nueva posición
                 
+                elif event.key == pygame.K_w:  # Guardar la traza de la última búsqueda
+                    if ultima_traza is not None:
+                        nombre = f"traza_{ultima_traza.algorithm}.trz"
+                        traza.dump(ultima_traza, nombre)
+                        almacenamiento_mensajes(f"Traza guardada en {nombre}")
                 elif event.key == pygame.K_t:
                     print(nombres_algt)
                     print(tiempos)
                     print(mensajes)
                     if nombres_algt and tiempos:
                         draw_sidebar(screen)
+                        import matplotlib.pyplot as plt
                         plt.figure(figsize=(10, 6))
                         barras = plt.bar(nombres_algt, tiempos, color='skyblue')
                         for i, bar in enumerate(barras):
@@ -0,0 +1,114 @@
+from array import array
+from collections import deque
+
+from grid import OBSTACLE
+
+# Índice de componentes conexas del laberinto: cada celda libre guarda la
+# etiqueta de su componente, así que "¿se puede llegar de A a B?" es una
+# comparación O(1) antes de lanzar cualquier búsqueda.
+# Se mantiene al día escuchando los cambios del grid:
+#   - liberar una celda une las componentes vecinas (se reetiqueta la menor
+#     dentro de la mayor);
+#   - bloquear una celda puede partir su componente; eso se resuelve de forma
+#     perezosa, reetiquetando solo esa componente la próxima vez que se consulte.
+
+
+class ComponentIndex:
+    def __init__(self, grid):
+        self.grid = grid
+        self.labels = array('i', [-1]) * len(grid)
+        self.sizes = {}
+        self._next = 0
+        self._dirty = {}  # etiqueta -> celdas desde donde reetiquetar
+        labels, cells = self.labels, grid.cells
+        for i in range(len(grid)):
+            if labels[i] == -1 and cells[i] != OBSTACLE:
+                self.sizes[self._next] = self._flood(i, self._next)
+                self._next += 1
+        grid.subscribe(self._on_cell_changed)
+
+    def close(self):
+        self.grid.unsubscribe(self._on_cell_changed)
+
+    def _flood(self, seed, label):
+        # Pinta con `label` la región conexa de seed que comparte su etiqueta actual
+        labels, mask, moves = self.labels, self.grid.mask, self.grid.moves
+        old = labels[seed]
+        labels[seed] = label
+        queue = deque([seed])
+        total = 1
+        while queue:
+            current = queue.popleft()
+            for off in moves[mask[current]]:
+                neighbor = current + off
+                if labels[neighbor] == old:
+                    labels[neighbor] = label
+                    queue.append(neighbor)
+                    total += 1
+        return total
+
+    def _resolve(self, label):
+        semillas = self._dirty.pop(label, None)
+        if semillas is None:
+            return
+        del self.sizes[label]
+        for seed in semillas:
+            if self.labels[seed] == label:
+                self.sizes[self._next] = self._flood(seed, self._next)
+                self._next += 1
+
+    def _on_cell_changed(self, i, antes, nuevo):
+        if (antes == OBSTACLE) == (nuevo == OBSTACLE):
+            return
+        labels = self.labels
+        if nuevo == OBSTACLE:
+            label = labels[i]
+            labels[i] = -1
+            self.sizes[label] -= 1
+            if self.sizes[label] == 0:
+                del self.sizes[label]
+                self._dirty.pop(label, None)
+            else:
+                self._dirty.setdefault(label, set()).update(self.grid.neighbors(i))
+            return
+
+        vecinos = self.grid.neighbors(i)
+        for j in vecinos:
+            self._resolve(labels[j])
+        distintas = {labels[j] for j in vecinos}
+        if not distintas:
+            labels[i] = self._next
+            self.sizes[self._next] = 1
+            self._next += 1
+            return
+        mayor = max(distintas, key=self.sizes.__getitem__)
+        labels[i] = mayor
+        self.sizes[mayor] += 1
+        for j in vecinos:
+            otra = labels[j]
+            if otra != mayor:
+                self._flood(j, mayor)
+                self.sizes[mayor] += self.sizes.pop(otra)
+
+    def component(self, pos):
+        label = self.labels[self.grid.index(pos)]
+        if label in self._dirty:
+            self._resolve(label)
+            label = self.labels[self.grid.index(pos)]
+        return None if label == -1 else label
+
+    def connected(self, a, b):
+        la = self.component(a)
+        return la is not None and la == self.component(b)
+
+
+def component_index(grid):
+    # Índice compartido, guardado en el grid y mantenido entre consultas
+    index = grid.derived.get('components')
+    if index is None:
+        index = grid.derived['components'] = ComponentIndex(grid)
+    return index
+
+
+def reachable(grid, start, goal):
+    return component_index(grid).connected(start, goal)
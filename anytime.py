@@ -0,0 +1,135 @@
+import time
+
+from busqueda import SearchStats, drain, index_heuristic, record_frontier, record_path
+from frontera import Frontier
+
+# Búsqueda anytime con ARA* (Likhachev, Gordon y Thrun, 2003). Empieza con A*
+# ponderado, f = g + ε·h con ε grande, que encuentra rápido un camino de costo
+# a lo sumo ε veces el óptimo; después baja ε de a `delta` y vuelve a buscar
+# reutilizando los g ya calculados: solo se reexpanden los nodos cuyo g mejoró
+# (los "inconsistentes"), no todo desde cero. Con ε = 1 el camino es óptimo.
+#
+# Se le puede dar un presupuesto de tiempo (segundos) o de expansiones; al
+# agotarlo devuelve el mejor camino encontrado hasta ahí, y stats.bound dice
+# cuánto más caro que el óptimo puede ser como máximo:
+#   min(ε, costo / mín(g + h) entre los abiertos e inconsistentes).
+
+EPSILON = 3.0
+DELTA = 0.5
+INF = float('inf')
+
+
+def iter_ara_star(grid, start, goal, observer=None, step=1, epsilon=EPSILON, delta=DELTA,
+                  time_budget=None, max_expanded=None):
+    stats = SearchStats('ara_star')
+    inicio = time.perf_counter()
+    limite = None if time_budget is None else inicio + time_budget
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    h = index_heuristic(grid, goal)  # admisible: todo paso cuesta al menos 1
+
+    def avisar(texto):
+        if observer is not None:
+            observer('message', texto)
+
+    eps = max(epsilon, 1.0)
+    frontier = Frontier()
+    push, pop, peek = frontier.push, frontier.pop, frontier.peek
+    push(s, eps * h(s), 0)
+    came_from = {s: None}
+    cost_so_far = {s: 0}
+    cerrados = set()
+    inconsistentes = set()
+    mejor = []           # mejor camino publicado hasta ahora
+    mejor_costo = INF
+    agotado = False
+
+    def camino():
+        path = []
+        current = g
+        while current != s:
+            path.append(position(current))
+            current = came_from[current]
+        path.reverse()
+        return path
+
+    def cota(costo, eps_cumplido):
+        # Cota inferior del óptimo: mín(g + h) entre los que aún pueden mejorar
+        piso = min((cost_so_far[u] + h(u) for u in (*frontier.entries, *inconsistentes)),
+                   default=costo)
+        return min(eps_cumplido, costo / piso if piso else 1.0)
+
+    eps_cumplido = INF   # ε de la última pasada completa
+    tramo = step
+    while True:
+        # --- ImprovePath: A* ponderado hasta que ninguna f abierta baje de g(meta)
+        while frontier:
+            _, f_min = peek()
+            if cost_so_far.get(g, INF) <= f_min:
+                break
+            if ((max_expanded is not None and stats.expanded >= max_expanded)
+                    or (limite is not None and time.perf_counter() >= limite)):
+                agotado = True
+                break
+            if tramo:
+                tramo -= 1
+                if not tramo:
+                    tramo = step
+                    yield stats
+            current, _ = pop()
+            cerrados.add(current)
+            stats.expanded += 1
+            if observer is not None:
+                observer('expand', position(current))
+
+            g_actual = cost_so_far[current]
+            for off in moves[mask[current]]:
+                neighbor = current + off
+                new_cost = g_actual + (1 if costs is None else costs[neighbor])
+                if new_cost < cost_so_far.get(neighbor, INF):
+                    cost_so_far[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    stats.generated += 1
+                    if neighbor in cerrados:
+                        inconsistentes.add(neighbor)
+                    else:
+                        push(neighbor, new_cost + eps * h(neighbor), new_cost)
+                        if observer is not None:
+                            observer('visit', position(neighbor))
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+
+        if not agotado:
+            eps_cumplido = eps
+        if g in cost_so_far and cost_so_far[g] < mejor_costo:
+            mejor = camino()
+            mejor_costo = grid.path_cost(mejor)
+            stats.bound = cota(mejor_costo, eps_cumplido)
+            avisar(f'ε={eps:g}: costo {mejor_costo}, a lo sumo x{stats.bound:.2f} del óptimo')
+        elif mejor:
+            stats.bound = cota(mejor_costo, eps_cumplido)
+        if agotado or eps <= 1.0 or g not in cost_so_far:
+            break
+
+        # --- Siguiente pasada: menor ε, los inconsistentes vuelven a abrirse
+        eps = max(eps - delta, 1.0)
+        abiertos = set(frontier.entries) | inconsistentes
+        record_frontier(stats, frontier)
+        frontier = Frontier()
+        push, pop, peek = frontier.push, frontier.pop, frontier.peek
+        for u in abiertos:
+            push(u, cost_so_far[u] + eps * h(u), cost_so_far[u])
+        inconsistentes.clear()
+        cerrados.clear()
+
+    if agotado:
+        avisar(f'Presupuesto agotado con ε={eps:g}')
+    record_frontier(stats, frontier)
+    return record_path(grid, stats, mejor, inicio)
+
+
+def ara_star(grid, start, goal, observer=None, epsilon=EPSILON, delta=DELTA,
+             time_budget=None, max_expanded=None):
+    return drain(iter_ara_star(grid, start, goal, observer, 0, epsilon, delta,
+                               time_budget, max_expanded))
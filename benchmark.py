@@ -0,0 +1,195 @@
+import argparse
+import csv
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import estrategias
+from grid import Grid
+
+# Banco de pruebas sin interfaz: corre cada estrategia sobre laberintos
+# generados con semilla fija (tamaño x densidad de obstáculos), con
+# calentamiento y repeticiones, y guarda los resultados en JSON/CSV para
+# comparar versiones. Uso típico:
+#   python benchmark.py --sizes 50 100 200 --densities 0.1 0.3 --json out.json
+#   python benchmark.py --json nuevo.json --baseline viejo.json
+
+DEFAULT_SIZES = (25, 50, 100, 200)
+DEFAULT_DENSITIES = (0.0, 0.2, 0.35)
+
+CAMPOS = ('algorithm', 'rows', 'cols', 'density', 'seed', 'found', 'path_length',
+          'path_cost', 'expanded', 'generated', 'pushes', 'pops', 'stale_pops',
+          'max_frontier', 'stored', 'reexpanded', 'repeats', 'median_s', 'p90_s', 'p99_s', 'min_s', 'max_s',
+          'peak_kib')
+
+
+def percentile(values, q):
+    # Interpolación lineal entre rangos, igual que numpy.percentile por defecto
+    ordenados = sorted(values)
+    if len(ordenados) == 1:
+        return ordenados[0]
+    k = (len(ordenados) - 1) * q / 100
+    f = int(k)
+    c = min(f + 1, len(ordenados) - 1)
+    return ordenados[f] + (ordenados[c] - ordenados[f]) * (k - f)
+
+
+def build_case(size, density, seed):
+    start, goal = (0, 0), (size - 1, size - 1)
+    grid = Grid.random(size, size, density, seed=seed, keep_free=(start, goal))
+    return grid, start, goal
+
+
+def measure(search, grid, start, goal, warmup, repeats, memory=True):
+    # Antes de cada corrida se descartan las estructuras que las estrategias
+    # incrementales guardan en el grid, para medir siempre una búsqueda en frío.
+    for _ in range(warmup):
+        grid.drop_derived()
+        search(grid, start, goal)
+    tiempos = []
+    for _ in range(repeats):
+        grid.drop_derived()
+        inicio = time.perf_counter()
+        path, stats = search(grid, start, goal)
+        tiempos.append(time.perf_counter() - inicio)
+
+    peak = None
+    if memory:
+        # Corrida aparte: tracemalloc frena la ejecución y ensuciaría los tiempos
+        grid.drop_derived()
+        tracemalloc.start()
+        search(grid, start, goal)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return path, stats, tiempos, peak
+
+
+def run(sizes, densities, algorithms, seed=0, warmup=1, repeats=5, memory=True, log=None):
+    resultados = []
+    for size in sizes:
+        for density in densities:
+            grid, start, goal = build_case(size, density, seed)
+            for nombre in algorithms:
+                search = estrategias.STRATEGIES[nombre]
+                path, stats, tiempos, peak = measure(
+                    search, grid, start, goal, warmup, repeats, memory)
+                fila = {
+                    'algorithm': nombre,
+                    'rows': size,
+                    'cols': size,
+                    'density': density,
+                    'seed': seed,
+                    'found': bool(path),
+                    'path_length': len(path),
+                    'path_cost': stats.path_cost,
+                    'expanded': stats.expanded,
+                    'generated': stats.generated,
+                    'pushes': stats.pushes,
+                    'pops': stats.pops,
+                    'stale_pops': stats.stale_pops,
+                    'max_frontier': stats.max_frontier,
+                    'stored': stats.stored,
+                    'reexpanded': stats.reexpanded,
+                    'repeats': repeats,
+                    'median_s': statistics.median(tiempos),
+                    'p90_s': percentile(tiempos, 90),
+                    'p99_s': percentile(tiempos, 99),
+                    'min_s': min(tiempos),
+                    'max_s': max(tiempos),
+                    'peak_kib': None if peak is None else round(peak / 1024, 1),
+                }
+                resultados.append(fila)
+                if log is not None:
+                    log(fila)
+    return resultados
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def write_json(filename, resultados, config):
+    with open(filename, 'w') as file:
+        json.dump({'environment': environment(), 'config': config,
+                   'results': resultados}, file, indent=2)
+
+
+def write_csv(filename, resultados):
+    with open(filename, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CAMPOS)
+        writer.writeheader()
+        writer.writerows(resultados)
+
+
+def compare(resultados, baseline_file, threshold):
+    # Compara medianas contra un JSON anterior; devuelve las regresiones
+    with open(baseline_file) as file:
+        previos = json.load(file)['results']
+    clave = lambda f: (f['algorithm'], f['rows'], f['cols'], f['density'], f['seed'])
+    indice = {clave(f): f for f in previos}
+    regresiones = []
+    for fila in resultados:
+        viejo = indice.get(clave(fila))
+        if viejo is None or not viejo['median_s']:
+            continue
+        ratio = fila['median_s'] / viejo['median_s']
+        marca = '  <-- regresión' if ratio > 1 + threshold else ''
+        print(f"{fila['algorithm']:>10} {fila['rows']}x{fila['cols']} d={fila['density']:.2f}: "
+              f"{viejo['median_s'] * 1e3:9.3f} ms -> {fila['median_s'] * 1e3:9.3f} ms "
+              f"(x{ratio:.2f}){marca}")
+        if marca:
+            regresiones.append((fila, viejo, ratio))
+    return regresiones
+
+
+def _imprimir(fila):
+    print(f"{fila['algorithm']:>10} {fila['rows']:>5}x{fila['cols']:<5} d={fila['density']:.2f} "
+          f"mediana={fila['median_s'] * 1e3:9.3f} ms p90={fila['p90_s'] * 1e3:9.3f} ms "
+          f"expandidos={fila['expanded']:>8} obsoletos={fila['stale_pops']:>6} "
+          f"frontera={fila['max_frontier']:>7} guardados={fila['stored']} "
+          f"memoria={fila['peak_kib']} KiB camino={fila['path_length']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de las estrategias de búsqueda.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--densities', type=float, nargs='+', default=list(DEFAULT_DENSITIES))
+    parser.add_argument('--algorithms', nargs='+', default=list(estrategias.STRATEGIES),
+                        choices=list(estrategias.STRATEGIES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='no medir el pico de memoria con tracemalloc')
+    parser.add_argument('--json', help='archivo JSON de salida')
+    parser.add_argument('--csv', help='archivo CSV de salida')
+    parser.add_argument('--baseline', help='JSON previo contra el cual comparar medianas')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='fracción de aumento que cuenta como regresión (por defecto 0.10)')
+    args = parser.parse_args(argv)
+
+    config = {k: getattr(args, k) for k in
+              ('sizes', 'densities', 'algorithms', 'seed', 'warmup', 'repeats')}
+    resultados = run(args.sizes, args.densities, args.algorithms, seed=args.seed,
+                     warmup=args.warmup, repeats=args.repeats,
+                     memory=not args.no_memory, log=_imprimir)
+    if args.json:
+        write_json(args.json, resultados, config)
+    if args.csv:
+        write_csv(args.csv, resultados)
+    if args.baseline:
+        if compare(resultados, args.baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import time
+
+from busqueda import SearchStats, drain, reconstruct_path, record_frontier, record_path
+from frontera import DEEP, Frontier
+
+# Búsquedas bidireccionales: una frontera crece desde el inicio y otra desde
+# la meta, y se detienen cuando se encuentran. En pasillos largos cada lado
+# explora solo la mitad del recorrido. Como la grilla es no dirigida, la
+# búsqueda hacia atrás usa los mismos vecinos que la de ida.
+
+INF = float('inf')
+
+
+def _join(grid, forward, backward, s, g, meet):
+    # Une las dos mitades: inicio -> encuentro con los padres de ida y
+    # encuentro -> meta recorriendo al revés los padres de vuelta.
+    ida = reconstruct_path(forward, s, meet) if meet != s else []
+    if meet != g:
+        vuelta = reconstruct_path(backward, g, meet)
+        vuelta.reverse()
+        ida += vuelta[1:] + [g]
+    return [grid.position(i) for i in ida]
+
+
+def _finish(grid, stats, forward, backward, s, g, meet, inicio):
+    path = [] if meet is None else _join(grid, forward, backward, s, g, meet)
+    return record_path(grid, stats, path, inicio)
+
+
+def iter_bidirectional_bfs(grid, start, goal, observer=None, step=1):
+    stats = SearchStats('bidirectional_bfs')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    if not (grid.passable(s) and grid.passable(g)):
+        return record_path(grid, stats, [], inicio)  # la búsqueda hacia atrás partiría de un obstáculo
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    forward, backward = {s: None}, {g: None}
+    dist_f, dist_b = {s: 0}, {g: 0}
+    layer_f, layer_b = [s], [g]
+    meet = s if s == g else None
+
+    tramo = step
+    while layer_f and layer_b and meet is None:
+        # Se expande siempre la capa más pequeña, completa, para que el
+        # primer encuentro sea el más corto
+        if len(layer_f) <= len(layer_b):
+            padres, dist, otros, otra_dist, capa = forward, dist_f, backward, dist_b, layer_f
+        else:
+            padres, dist, otros, otra_dist, capa = backward, dist_b, forward, dist_f, layer_b
+        siguiente = []
+        mejor = INF
+        for current in capa:
+            if tramo:
+                tramo -= 1
+                if not tramo:
+                    tramo = step
+                    yield stats
+            stats.expanded += 1
+            if observer is not None:
+                observer('expand', position(current))
+            d = dist[current] + 1
+            for off in moves[mask[current]]:
+                neighbor = current + off
+                if neighbor in padres:
+                    continue
+                padres[neighbor] = current
+                dist[neighbor] = d
+                siguiente.append(neighbor)
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+                if neighbor in otros and d + otra_dist[neighbor] < mejor:
+                    mejor = d + otra_dist[neighbor]
+                    meet = neighbor
+        if capa is layer_f:
+            layer_f = siguiente
+        else:
+            layer_b = siguiente
+        if len(layer_f) + len(layer_b) > stats.max_frontier:
+            stats.max_frontier = len(layer_f) + len(layer_b)
+
+    # Capas simples: cada nodo entra y sale una sola vez (más las dos semillas)
+    stats.pushes, stats.pops = stats.generated + 2, stats.expanded
+    return _finish(grid, stats, forward, backward, s, g, meet, inicio)
+
+
+def bidirectional_bfs(grid, start, goal, observer=None):
+    return drain(iter_bidirectional_bfs(grid, start, goal, observer, 0))
+
+
+def iter_bidirectional_a_star(grid, start, goal, observer=None, step=1, tie_break=DEEP):
+    stats = SearchStats('bidirectional_a_star')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    if not (grid.passable(s) and grid.passable(g)):
+        return record_path(grid, stats, [], inicio)  # la búsqueda hacia atrás partiría de un obstáculo
+    mask, moves, position, cols = grid.mask, grid.moves, grid.position, grid.cols
+    sr, sc = start
+    gr, gc = goal
+
+    def h_forward(i):
+        r, c = divmod(i, cols)
+        return abs(r - gr) + abs(c - gc)
+
+    def h_backward(i):
+        r, c = divmod(i, cols)
+        return abs(r - sr) + abs(c - sc)
+
+    forward, backward = {s: None}, {g: None}
+    cost_f, cost_b = {s: 0}, {g: 0}
+    open_f, open_b = Frontier(tie_break), Frontier(tie_break)
+    open_f.push(s, h_forward(s), 0)
+    open_b.push(g, h_backward(g), 0)
+    mejor = 0 if s == g else INF
+    meet = s if s == g else None
+
+    tramo = step
+    while open_f and open_b:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        # Criterio de parada: ningún camino por nodos abiertos puede mejorar mu
+        if max(open_f.peek()[1], open_b.peek()[1]) >= mejor:
+            break
+        if len(open_f) <= len(open_b):
+            frontier, padres, costo, h = open_f, forward, cost_f, h_forward
+            otro_costo = cost_b
+        else:
+            frontier, padres, costo, h = open_b, backward, cost_b, h_backward
+            otro_costo = cost_f
+
+        current, _ = frontier.pop()
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(current))
+
+        new_cost = costo[current] + 1
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            if neighbor not in costo or new_cost < costo[neighbor]:
+                costo[neighbor] = new_cost
+                padres[neighbor] = current
+                frontier.push(neighbor, new_cost + h(neighbor), new_cost)
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+                if neighbor in otro_costo and new_cost + otro_costo[neighbor] < mejor:
+                    mejor = new_cost + otro_costo[neighbor]
+                    meet = neighbor
+        if len(open_f) + len(open_b) > stats.max_frontier:
+            stats.max_frontier = len(open_f) + len(open_b)
+
+    record_frontier(stats, open_f, open_b)
+    return _finish(grid, stats, forward, backward, s, g, meet, inicio)
+
+
+def bidirectional_a_star(grid, start, goal, observer=None, tie_break=DEEP):
+    return drain(iter_bidirectional_a_star(grid, start, goal, observer, 0, tie_break))
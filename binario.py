@@ -0,0 +1,89 @@
+import argparse
+import mmap
+import struct
+import sys
+
+from grid import Grid, load_config
+
+# Formato binario para mapas grandes: una cabecera fija y después las celdas
+# y las máscaras de movimiento, un byte por celda cada una, en el mismo orden
+# que Grid.cells y Grid.mask, y opcionalmente los costos de terreno (otro
+# byte por celda, solo si el laberinto los tiene). Cargar un archivo es
+# mapearlo en memoria y apuntar el grid a esas zonas: no se interpreta JSON,
+# no se copian las celdas ni se recalculan las máscaras, así que un mapa de
+# 10k x 10k abre en milisegundos y el sistema operativo solo lee las páginas
+# que se tocan.
+#
+#   python binario.py maze_config.json maze.lab
+#
+# Con numpy, numpy.frombuffer(grid.cells, numpy.uint8) da una vista sin copia.
+
+MAGIC = b'LAB1'
+# magia, filas, columnas, inicio (fila, columna), meta (fila, columna)
+CABECERA = struct.Struct('<4s6I')
+
+
+def save(filename, grid, start, goal):
+    with open(filename, 'wb') as file:
+        file.write(CABECERA.pack(MAGIC, grid.rows, grid.cols, *start, *goal))
+        file.write(grid.cells)
+        file.write(grid.mask)
+        if grid.costs is not None:
+            file.write(grid.costs)
+
+
+def load(filename, writable=False):
+    # Por defecto el mapeo es copy-on-write: el grid se puede editar (clics en
+    # la GUI) sin tocar el archivo. Con writable=True los cambios se guardan.
+    with open(filename, 'r+b' if writable else 'rb') as file:
+        datos = mmap.mmap(file.fileno(), 0,
+                          access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY)
+    if len(datos) < CABECERA.size:
+        raise ValueError(f'{filename}: archivo demasiado corto')
+    magic, rows, cols, sr, sc, gr, gc = CABECERA.unpack_from(datos)
+    if magic != MAGIC:
+        raise ValueError(f'{filename}: no es un laberinto binario')
+    n = rows * cols
+    secciones, sobra = divmod(len(datos) - CABECERA.size, n) if n else (2, 0)
+    if sobra or secciones not in (2, 3):
+        raise ValueError(f'{filename}: tamaño {len(datos)} no corresponde a '
+                         f'un laberinto de {rows}x{cols}')
+    vista = memoryview(datos)
+    cells = vista[CABECERA.size:CABECERA.size + n]
+    mask = vista[CABECERA.size + n:CABECERA.size + 2 * n]
+    costs = vista[CABECERA.size + 2 * n:] if secciones == 3 else None
+    return Grid(rows, cols, cells, mask, costs), (sr, sc), (gr, gc)
+
+
+def is_binary(filename):
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def load_maze(filename):
+    # Acepta tanto el JSON de siempre como el formato binario
+    if is_binary(filename):
+        return load(filename)
+    return load_config(filename)
+
+
+def convert(json_filename, filename):
+    grid, start, goal = load_config(json_filename)
+    save(filename, grid, start, goal)
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Convierte un maze_config.json al formato binario mapeable.')
+    parser.add_argument('config', help='archivo JSON de entrada')
+    parser.add_argument('salida', help='archivo binario de salida')
+    args = parser.parse_args(argv)
+    grid = convert(args.config, args.salida)
+    secciones = 2 if grid.costs is None else 3
+    print(f'{args.salida}: {grid.rows}x{grid.cols}, '
+          f'{CABECERA.size + secciones * len(grid)} bytes', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,470 @@
+import time
+from collections import deque
+
+from alcance import reachable
+from frontera import DEEP, FIFO, Frontier
+from padres import ParentMap
+
+# Núcleo de búsqueda sin interfaz gráfica: no importa pygame ni dibuja nada.
+# Cada búsqueda recibe el laberinto (un grid.Grid), inicio y meta, y
+# devuelve (camino, estadisticas). La GUI u otro consumidor puede suscribirse
+# pasando un observador: observer(evento, dato), con eventos
+#   'expand'  -> se saca un nodo de la frontera (dato = posición)
+#   'visit'   -> se descubre un vecino nuevo (dato = posición)
+#   'message' -> texto informativo para el usuario (dato = str)
+# Las estadísticas son un objeto con contadores fijos; quien quiera recibirlas
+# de todas las búsquedas (perfiladores, la barra lateral de la GUI) se
+# registra con estrategias.add_hook.
+
+
+class SearchStats:
+    __slots__ = ('algorithm', 'expanded', 'generated', 'pushes', 'pops', 'stale_pops',
+                 'max_frontier', 'path_length', 'path_cost', 'elapsed', 'peak_bytes', 'bound',
+                 'stored', 'reexpanded')
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.expanded = 0       # nodos sacados de la frontera y expandidos
+        self.generated = 0      # vecinos nuevos o mejorados
+        self.pushes = 0         # inserciones en la frontera
+        self.pops = 0           # extracciones, incluidas las obsoletas
+        self.stale_pops = 0     # extracciones descartadas por obsoletas
+        self.max_frontier = 0
+        self.path_length = 0
+        self.path_cost = 0      # suma de costos de terreno del camino
+        self.elapsed = 0.0      # segundos dentro de la búsqueda (ver estrategias._instrumented)
+        self.peak_bytes = None  # pico de tracemalloc, solo si se pidió medirlo
+        self.bound = None       # cota de suboptimalidad, solo en búsquedas anytime
+        self.stored = None      # nodos guardados a la vez (pico), si se conoce
+        self.reexpanded = 0     # expansiones de nodos que ya se habían expandido
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        campos = ', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())
+        return f'SearchStats({campos})'
+
+
+# --- Funciones auxiliares ---
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def index_heuristic(grid, goal):
+    # Manhattan sobre índices planos, con la meta ya descompuesta
+    gr, gc = goal
+    cols = grid.cols
+
+    def h(i):
+        r, c = divmod(i, cols)
+        return abs(r - gr) + abs(c - gc)
+    return h
+
+
+def reconstruct_path(came_from, start, goal):
+    if isinstance(came_from, ParentMap):
+        return came_from.path(goal)
+    current = goal
+    path = []
+    while current != start:
+        path.append(current)
+        current = came_from.get(current)
+        if current is None:
+            return []
+    path.reverse()
+    return path
+
+
+def record_frontier(stats, *frontiers):
+    # Suma a stats los contadores de una o más fronteras (frontera.Frontier)
+    for frontier in frontiers:
+        stats.pushes += frontier.pushes
+        stats.pops += frontier.pops + frontier.stale
+        stats.stale_pops += frontier.stale
+
+
+def record_path(grid, stats, path, inicio):
+    stats.path_length = len(path)
+    stats.path_cost = grid.path_cost(path)
+    stats.elapsed = time.perf_counter() - inicio
+    return path, stats
+
+
+def parents(grid, s, compact):
+    # came_from de una búsqueda: diccionario, o con compact=True el registro
+    # de 3 bits por celda de padres.py (más lento, pero cabe en memoria en
+    # mapas enormes)
+    return ParentMap(grid, s) if compact else {s: None}
+
+
+def _finish(grid, stats, came_from, s, g, inicio):
+    if isinstance(came_from, dict):
+        stats.stored = len(came_from)  # nunca se descarta nada
+    path = [grid.position(i) for i in reconstruct_path(came_from, s, g)]
+    return record_path(grid, stats, path, inicio)
+
+
+def drain(pasos):
+    # Corre hasta el final una búsqueda paso a paso y devuelve su resultado
+    try:
+        while True:
+            next(pasos)
+    except StopIteration as fin:
+        return fin.value
+
+
+# --- Búsquedas ---
+# Internamente todas trabajan con índices enteros de celda; las posiciones
+# (fila, columna) solo se construyen para el observador y el camino final.
+# Cada búsqueda existe en dos formas: iter_<nombre>(..., step) es un generador
+# que cede el control (entregando las estadísticas parciales) cada `step`
+# expansiones, para que un planificador de cuadros la avance sin bloquear la
+# ventana; <nombre>(...) la corre completa sin pausas.
+def iter_bfs(grid, start, goal, observer=None, step=1, compact=False):
+    stats = SearchStats('bfs')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    queue = deque([s])
+    came_from = parents(grid, s, compact)
+
+    tramo = step
+    while queue:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current = queue.popleft()
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(current))
+
+        if current == g:
+            break
+
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            if neighbor not in came_from:
+                queue.append(neighbor)
+                came_from[neighbor] = current
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+        if len(queue) > stats.max_frontier:
+            stats.max_frontier = len(queue)
+
+    # Cola simple: cada nodo entra y sale una sola vez
+    stats.pushes, stats.pops = stats.generated + 1, stats.expanded
+    return _finish(grid, stats, came_from, s, g, inicio)
+
+
+def bfs(grid, start, goal, observer=None, compact=False):
+    return drain(iter_bfs(grid, start, goal, observer, 0, compact))
+
+
+def iter_dfs(grid, start, goal, observer=None, step=1, compact=False):
+    stats = SearchStats('dfs')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    stack = [s]
+    came_from = parents(grid, s, compact)
+
+    tramo = step
+    while stack:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current = stack.pop()
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(current))
+
+        if current == g:
+            break
+
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            if neighbor not in came_from:
+                stack.append(neighbor)
+                came_from[neighbor] = current
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+        if len(stack) > stats.max_frontier:
+            stats.max_frontier = len(stack)
+
+    stats.pushes, stats.pops = stats.generated + 1, stats.expanded
+    return _finish(grid, stats, came_from, s, g, inicio)
+
+
+def dfs(grid, start, goal, observer=None, compact=False):
+    return drain(iter_dfs(grid, start, goal, observer, 0, compact))
+
+
+def iter_a_star(grid, start, goal, observer=None, step=1, tie_break=DEEP, compact=False):
+    stats = SearchStats('a_star')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    h = index_heuristic(grid, goal)  # admisible: todo paso cuesta al menos 1
+    frontier = Frontier(tie_break)  # en empates de f, por defecto el de mayor g
+    frontier.push(s, h(s), 0)
+    push, pop = frontier.push, frontier.pop
+    came_from = parents(grid, s, compact)
+    cost_so_far = {s: 0}
+
+    tramo = step
+    while frontier:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current, f = pop()
+        stats.expanded += 1
+        g_actual = cost_so_far[current]
+        if observer is not None:
+            observer('expand', position(current))
+            observer('message', f'f({stats.expanded}): {g_actual} + {f - g_actual} = {f}')
+
+        if current == g:
+            break
+
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            new_cost = g_actual + (1 if costs is None else costs[neighbor])
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                push(neighbor, new_cost + h(neighbor), new_cost)
+                came_from[neighbor] = current
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+        if len(frontier) > stats.max_frontier:
+            stats.max_frontier = len(frontier)
+
+    record_frontier(stats, frontier)
+    return _finish(grid, stats, came_from, s, g, inicio)
+
+
+def a_star(grid, start, goal, observer=None, tie_break=DEEP, compact=False):
+    return drain(iter_a_star(grid, start, goal, observer, 0, tie_break, compact))
+
+
+# --- Búsqueda por Costo Uniforme ---
+def iter_uniform_cost_search(grid, start, goal, observer=None, step=1, tie_break=FIFO,
+                             compact=False):
+    stats = SearchStats('uniform_cost_search')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    frontier = Frontier(tie_break)  # prioridad = costo acumulado
+    frontier.push(s, 0, 0)
+    push, pop = frontier.push, frontier.pop
+    came_from = parents(grid, s, compact)
+    cost_so_far = {s: 0}
+    new_cost = 0
+
+    tramo = step
+    while frontier:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current, _ = pop()
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(current))
+
+        if current == g:
+            break
+
+        g_actual = cost_so_far[current]
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            # Costo de terreno de la celda a la que se entra (1 si no hay terreno)
+            new_cost = g_actual + (1 if costs is None else costs[neighbor])
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                push(neighbor, new_cost, new_cost)
+                came_from[neighbor] = current
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+        if len(frontier) > stats.max_frontier:
+            stats.max_frontier = len(frontier)
+        if observer is not None:
+            observer('message', f'El costo total g({stats.expanded}): {new_cost}')
+
+    record_frontier(stats, frontier)
+    return _finish(grid, stats, came_from, s, g, inicio)
+
+
+def uniform_cost_search(grid, start, goal, observer=None, tie_break=FIFO, compact=False):
+    return drain(iter_uniform_cost_search(grid, start, goal, observer, 0, tie_break, compact))
+
+
+# --- Dijkstra con cola de cubetas (Dial) ---
+# Los costos de terreno son enteros entre 1 y C, así que las distancias en la
+# frontera nunca se separan más de C: basta un arreglo circular de C + 1
+# cubetas indexado por distancia, con inserción y extracción O(1) en vez del
+# O(log n) del heap. Con todos los costos en 1 se comporta como BFS.
+def iter_dial_search(grid, start, goal, observer=None, step=1, compact=False):
+    stats = SearchStats('dial_search')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    ancho = grid.max_cost() + 1
+    buckets = [[] for _ in range(ancho)]
+    buckets[0].append(s)
+    came_from = parents(grid, s, compact)
+    cost_so_far = {s: 0}
+    pendientes = 1
+    d = 0
+
+    tramo = step
+    while pendientes:
+        cubeta = buckets[d % ancho]
+        if not cubeta:
+            d += 1
+            continue
+        current = cubeta.pop()
+        pendientes -= 1
+        if cost_so_far[current] != d:
+            stats.stale_pops += 1  # entrada obsoleta: ya salió con una distancia menor
+            continue
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(current))
+
+        if current == g:
+            break
+
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            new_cost = d + (1 if costs is None else costs[neighbor])
+            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                cost_so_far[neighbor] = new_cost
+                buckets[new_cost % ancho].append(neighbor)
+                pendientes += 1
+                came_from[neighbor] = current
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+        if pendientes > stats.max_frontier:
+            stats.max_frontier = pendientes
+
+    stats.pushes = stats.generated + 1
+    stats.pops = stats.expanded + stats.stale_pops
+    return _finish(grid, stats, came_from, s, g, inicio)
+
+
+def dial_search(grid, start, goal, observer=None, compact=False):
+    return drain(iter_dial_search(grid, start, goal, observer, 0, compact))
+
+
+# --- Búsqueda Avara ---
+def iter_greedy_best_first_search(grid, start, goal, observer=None, step=1,
+                                  tie_break=FIFO, compact=False):
+    stats = SearchStats('greedy_best_first_search')
+    inicio = time.perf_counter()
+    s, g = grid.index(start), grid.index(goal)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    h = index_heuristic(grid, goal)
+    priority = h(s)
+    frontier = Frontier(tie_break)  # prioridad = heurística
+    frontier.push(s, priority)
+    push, pop = frontier.push, frontier.pop
+    came_from = parents(grid, s, compact)
+
+    tramo = step
+    while frontier:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current, _ = pop()
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(current))
+
+        if current == g:
+            break
+
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            if neighbor not in came_from:
+                priority = h(neighbor)  # Solo usa la heurística
+                push(neighbor, priority)
+                came_from[neighbor] = current
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(neighbor))
+        if len(frontier) > stats.max_frontier:
+            stats.max_frontier = len(frontier)
+        if observer is not None:
+            observer('message', f'H({stats.expanded}): {priority}')
+
+    record_frontier(stats, frontier)
+    return _finish(grid, stats, came_from, s, g, inicio)
+
+
+def greedy_best_first_search(grid, start, goal, observer=None, tie_break=FIFO, compact=False):
+    return drain(iter_greedy_best_first_search(grid, start, goal, observer, 0, tie_break,
+                                               compact))
+
+
+# --- Búsqueda Híbrida ---
+def iter_hybrid_search(grid, start, goal, observer=None, step=1):
+    def avisar(texto):
+        if observer is not None:
+            observer('message', texto)
+
+    pasos = [
+        (iter_bfs, "Intentando BFS...", "Ruta encontrada con BFS."),
+        (iter_a_star, "- BFS falló. Intentando A*...", "- Ruta encontrada con A*."),
+        (iter_uniform_cost_search, "- A* falló. Intentando Búsqueda por Costo Uniforme...",
+         ":) Ruta encontrada con Búsqueda por Costo Uniforme."),
+        (iter_greedy_best_first_search, "- Costo Uniforme falló. Intentando Búsqueda Avara...",
+         ":) Ruta encontrada con Búsqueda Avara."),
+        (iter_dfs, "- Búsqueda Avara falló. Intentando DFS...", ":) Ruta encontrada con DFS."),
+    ]
+    stats = SearchStats('hybrid_search')
+    inicio = time.perf_counter()
+    path = []
+    # Si la meta está en otra componente ninguna técnica va a encontrarla:
+    # se responde de inmediato en vez de inundar la componente cinco veces.
+    if not reachable(grid, start, goal):
+        avisar(":( La meta no es alcanzable desde el inicio.")
+        return record_path(grid, stats, path, inicio)
+    for algoritmo, intento, exito in pasos:
+        avisar(intento)
+        path, parcial = yield from algoritmo(grid, start, goal, observer, step)
+        for contador in ('expanded', 'generated', 'pushes', 'pops', 'stale_pops'):
+            setattr(stats, contador, getattr(stats, contador) + getattr(parcial, contador))
+        stats.max_frontier = max(stats.max_frontier, parcial.max_frontier)
+        if path:
+            avisar(exito)
+            break
+    else:
+        avisar(":( No se encontró una ruta válida con ninguna técnica.")
+    return record_path(grid, stats, path, inicio)
+
+
+def hybrid_search(grid, start, goal, observer=None):
+    return drain(iter_hybrid_search(grid, start, goal, observer, 0))
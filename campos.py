@@ -0,0 +1,207 @@
+import time
+from array import array
+from collections import OrderedDict, deque
+
+from busqueda import SearchStats, drain, record_path
+
+# Campos de distancia hacia una meta: un BFS inverso desde la meta deja en
+# cada celda su distancia, y desde ahí cualquier inicio obtiene su camino
+# bajando por el campo en O(largo del camino). Como casi todas las consultas
+# comparten la meta y solo cambia el inicio (tecla S), los campos se guardan
+# en una caché LRU con llave (meta, versión del grid): cualquier cambio de
+# obstáculos sube la versión y deja inservibles los campos anteriores.
+
+UNREACHABLE = -1
+
+# numpy es opcional (sin él se usa el BFS de Python) y se importa recién la
+# primera vez que un campo grande lo necesita: importarlo cuesta decenas de
+# milisegundos que no tiene por qué pagar cada arranque
+_np = False
+
+
+def _numpy():
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+# Desde este tamaño, si numpy está instalado, los campos se calculan con el
+# frente de onda vectorizado; en mapas chicos el BFS de Python gana
+WAVEFRONT_MIN_CELLS = 50_000
+
+
+def distance_field(grid, goal_index, stats=None):
+    return drain(iter_distance_field(grid, goal_index, stats, 0))
+
+
+def iter_distance_field(grid, goal_index, stats=None, step=1):
+    if len(grid) >= WAVEFRONT_MIN_CELLS and _numpy() is not None:
+        return (yield from iter_wavefront(grid, [goal_index], stats, step))
+    dist = array('i', [UNREACHABLE]) * len(grid)
+    mask, moves = grid.mask, grid.moves
+    dist[goal_index] = 0
+    queue = deque([goal_index])
+    tramo = step
+    while queue:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current = queue.popleft()
+        d = dist[current] + 1
+        for off in moves[mask[current]]:
+            neighbor = current + off
+            if dist[neighbor] == UNREACHABLE:
+                dist[neighbor] = d
+                queue.append(neighbor)
+        if stats is not None:
+            stats.expanded += 1
+            stats.pushes += 1
+            stats.pops += 1
+    return dist
+
+
+def wavefront(grid, sources, stats=None):
+    return drain(iter_wavefront(grid, sources, stats, 0))
+
+
+def iter_wavefront(grid, sources, stats=None, step=1):
+    # BFS por capas con numpy: el frente es un arreglo de índices, y la capa
+    # siguiente sale de sumarle a cada celda el desplazamiento de cada
+    # dirección que su máscara permite, quitando las ya visitadas y las
+    # repetidas. Son unas pocas operaciones de arreglo por capa, en lugar de
+    # una operación de Python por celda. Devuelve el campo plano (índice de
+    # celda -> distancia) como arreglo int32; con varias fuentes, cada celda
+    # queda con la distancia a la más cercana. Aquí `step` cuenta capas.
+    np = _numpy()
+    if np is None:
+        raise ImportError('iter_wavefront necesita numpy')
+    mask = np.frombuffer(grid.mask, dtype=np.uint8)
+    dist = np.full(len(grid), UNREACHABLE, dtype=np.int32)
+    marca = np.empty(len(grid), dtype=np.intp)  # para descartar repetidas
+    frente = np.unique(np.asarray(sources, dtype=np.intp))
+    dist[frente] = 0
+    offsets = grid.offsets
+    d = 0
+    tramo = step
+    while frente.size:
+        if stats is not None:
+            stats.expanded += frente.size
+            stats.pushes += frente.size
+            stats.pops += frente.size
+            stats.max_frontier = max(stats.max_frontier, frente.size)
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        d += 1
+        m = mask[frente]
+        vecinos = np.concatenate([frente[(m & (1 << k)) != 0] + offsets[k]
+                                  for k in range(4)])
+        vecinos = vecinos[dist[vecinos] == UNREACHABLE]
+        # Una celda puede llegar desde varios lados: con asignación repetida
+        # numpy deja el último valor, así que se queda la última aparición
+        orden = np.arange(vecinos.size)
+        marca[vecinos] = orden
+        vecinos = vecinos[marca[vecinos] == orden]
+        dist[vecinos] = d
+        frente = vecinos
+    return dist
+
+
+def descend(grid, dist, start_index):
+    # Camino desde start bajando un paso de distancia a la vez (índices), o
+    # None si no hay por dónde bajar (p. ej. la meta es un obstáculo: su
+    # máscara igual lista a sus vecinos libres)
+    d = dist[start_index]
+    if d == UNREACHABLE:
+        return None
+    mask, moves = grid.mask, grid.moves
+    path = []
+    current = start_index
+    while d > 0:
+        for off in moves[mask[current]]:
+            if dist[current + off] == d - 1:
+                current += off
+                break
+        else:
+            return None
+        d -= 1
+        path.append(current)
+    return path
+
+
+class DistanceFieldCache:
+    def __init__(self, grid, capacity=8):
+        self.grid = grid
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._fields = OrderedDict()
+        self._version = grid.version
+
+    def field(self, goal, stats=None):
+        return drain(self.iter_field(goal, stats, 0))
+
+    def iter_field(self, goal, stats=None, step=1):
+        grid = self.grid
+        if grid.version != self._version:
+            # El laberinto cambió: ningún campo guardado sigue siendo válido
+            self._fields.clear()
+            self._version = grid.version
+        key = (grid.index(goal), grid.version)
+        dist = self._fields.get(key)
+        if dist is not None:
+            self._fields.move_to_end(key)
+            self.hits += 1
+            return dist
+        self.misses += 1
+        dist = yield from iter_distance_field(grid, key[0], stats, step)
+        self._fields[key] = dist
+        if len(self._fields) > self.capacity:
+            self._fields.popitem(last=False)
+        return dist
+
+    def path(self, start, goal, stats=None):
+        return drain(self.iter_path(start, goal, stats, 0))
+
+    def iter_path(self, start, goal, stats=None, step=1):
+        dist = yield from self.iter_field(goal, stats, step)
+        indices = descend(self.grid, dist, self.grid.index(start))
+        if indices is None:
+            return []
+        return [self.grid.position(i) for i in indices]
+
+    def clear(self):
+        self._fields.clear()
+
+
+def distance_field_cache(grid):
+    cache = grid.derived.get('distance_fields')
+    if cache is None:
+        cache = grid.derived['distance_fields'] = DistanceFieldCache(grid)
+    return cache
+
+
+def distance_field_search(grid, start, goal, observer=None):
+    return drain(iter_distance_field_search(grid, start, goal, observer, 0))
+
+
+def iter_distance_field_search(grid, start, goal, observer=None, step=1):
+    # Estrategia: en un acierto de caché no se expande ningún nodo
+    stats = SearchStats('distance_field_search')
+    inicio = time.perf_counter()
+    if not (grid.passable(grid.index(start)) and grid.passable(grid.index(goal))):
+        return record_path(grid, stats, [], inicio)
+    path = yield from distance_field_cache(grid).iter_path(start, goal, stats, step)
+    if observer is not None:
+        for pos in path:
+            observer('visit', pos)
+    return record_path(grid, stats, path, inicio)
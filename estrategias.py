@@ -0,0 +1,153 @@
+import time
+import tracemalloc
+
+import acotada
+import anytime
+import bidireccional
+import busqueda
+import campos
+import incremental
+import jerarquico
+import jps
+import multimeta
+
+# Registro de estrategias disponibles: nombre corto -> función
+# search(grid, start, goal, observer=None) que devuelve (camino, estadisticas).
+# La GUI, el benchmark y cualquier script eligen el algoritmo por su clave.
+# Solo astar, ucs, dial, hpa, multibfs, multiastar, arastar, idastar y smastar
+# respetan los costos de terreno (grid.costs); las demás tratan cada paso como
+# costo 1.
+# hpa da caminos casi óptimos. multibfs y multiastar van a la meta más cercana
+# entre todas las celdas GOAL del laberinto (más la meta pedida). arastar es
+# anytime: sin presupuesto termina en el óptimo; con uno (anytime.ara_star)
+# devuelve el mejor camino hasta ahí y su cota de suboptimalidad en stats.bound.
+# idastar y smastar acotan la memoria a costa de reexpandir nodos (stats.stored
+# y stats.reexpanded); smastar solo es óptima si el camino cabe en su memoria.
+
+STRATEGIES = {
+    'bfs': busqueda.bfs,
+    'dfs': busqueda.dfs,
+    'astar': busqueda.a_star,
+    'ucs': busqueda.uniform_cost_search,
+    'dial': busqueda.dial_search,
+    'greedy': busqueda.greedy_best_first_search,
+    'hybrid': busqueda.hybrid_search,
+    'dstar': incremental.d_star_lite,
+    'jps': jps.jump_point_search,
+    'bibfs': bidireccional.bidirectional_bfs,
+    'biastar': bidireccional.bidirectional_a_star,
+    'distfield': campos.distance_field_search,
+    'hpa': jerarquico.hpa_star,
+    'multibfs': multimeta.multi_source_search,
+    'multiastar': multimeta.multi_goal_a_star,
+    'arastar': anytime.ara_star,
+    'idastar': acotada.ida_star,
+    'smastar': acotada.sma_star,
+}
+
+
+def solve(grid, start, goal, algorithm='astar', observer=None, memory=False):
+    if algorithm not in STRATEGIES:
+        raise ValueError(f'Estrategia desconocida: {algorithm!r} '
+                         f'(opciones: {", ".join(STRATEGIES)})')
+    return busqueda.drain(iter_solve(grid, start, goal, algorithm, observer, 0, memory))
+
+
+# Mismas estrategias en forma de generador: iter_search(grid, start, goal,
+# observer, step) cede el control cada `step` expansiones (ver busqueda.py)
+STEPPERS = {
+    'bfs': busqueda.iter_bfs,
+    'dfs': busqueda.iter_dfs,
+    'astar': busqueda.iter_a_star,
+    'ucs': busqueda.iter_uniform_cost_search,
+    'dial': busqueda.iter_dial_search,
+    'greedy': busqueda.iter_greedy_best_first_search,
+    'hybrid': busqueda.iter_hybrid_search,
+    'dstar': incremental.iter_d_star_lite,
+    'jps': jps.iter_jump_point_search,
+    'bibfs': bidireccional.iter_bidirectional_bfs,
+    'biastar': bidireccional.iter_bidirectional_a_star,
+    'distfield': campos.iter_distance_field_search,
+    'hpa': jerarquico.iter_hpa_star,
+    'multibfs': multimeta.iter_multi_source_search,
+    'multiastar': multimeta.iter_multi_goal_a_star,
+    'arastar': anytime.iter_ara_star,
+    'idastar': acotada.iter_ida_star,
+    'smastar': acotada.iter_sma_star,
+}
+
+
+def iter_solve(grid, start, goal, algorithm='astar', observer=None, step=1, memory=False):
+    try:
+        stepper = STEPPERS[algorithm]
+    except KeyError:
+        raise ValueError(f'Estrategia desconocida: {algorithm!r} '
+                         f'(opciones: {", ".join(STEPPERS)})') from None
+    # Un inicio o una meta sobre un obstáculo (grid.from_config lo permite) no
+    # tienen ruta, con cualquier estrategia
+    if grid.passable(grid.index(start)) and grid.passable(grid.index(goal)):
+        pasos = stepper(grid, start, goal, observer, step)
+    else:
+        pasos = _sin_ruta(grid, STRATEGIES[algorithm].__name__)
+    return _instrumented(pasos, algorithm, memory)
+
+
+def _sin_ruta(grid, nombre):
+    stats = busqueda.SearchStats(nombre)
+    return busqueda.record_path(grid, stats, [], time.perf_counter())
+    yield  # generador sin pasos, para que _instrumented lo trate como a los demás
+
+
+# --- Ganchos de instrumentación ---
+# Toda búsqueda lanzada con solve/iter_solve avisa a los ganchos registrados:
+#   hook('start', clave)   -> antes de empezar (clave del registro)
+#   hook('finish', stats)  -> al terminar, con el SearchStats completo
+# Los usan la barra lateral de la GUI y cualquier perfilador externo.
+# Con memory=True además se mide el pico de memoria con tracemalloc (lento).
+# stats.elapsed queda con el tiempo que la búsqueda pasó corriendo, sin las
+# pausas entre pasos: record_path mide de punta a punta, y con step > 0 eso
+# incluiría el tiempo que el planificador de la GUI la tuvo suspendida.
+_HOOKS = []
+
+
+def add_hook(hook):
+    _HOOKS.append(hook)
+
+
+def remove_hook(hook):
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+def _notify(evento, dato):
+    for hook in list(_HOOKS):
+        hook(evento, dato)
+
+
+def _instrumented(pasos, algorithm, memory):
+    _notify('start', algorithm)
+    # Si tracemalloc ya estaba activo es de alguien más: no se toca su pico
+    medir = memory and not tracemalloc.is_tracing()
+    if medir:
+        tracemalloc.start()
+    corriendo = 0.0
+    try:
+        while True:
+            antes = time.perf_counter()
+            try:
+                paso = next(pasos)
+            except StopIteration as fin:
+                corriendo += time.perf_counter() - antes
+                path, stats = fin.value
+                break
+            corriendo += time.perf_counter() - antes
+            yield paso
+        stats.elapsed = corriendo
+        if medir:
+            stats.peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        pasos.close()
+        if medir:
+            tracemalloc.stop()
+    _notify('finish', stats)
+    return path, stats
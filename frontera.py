@@ -0,0 +1,100 @@
+import heapq
+
+# Frontera compartida por las búsquedas con prioridad (A*, Costo Uniforme,
+# Avara, A* bidireccional, JPS, D* Lite). Es un heap con borrado perezoso:
+# cada elemento guarda su entrada vigente, y mejorar su prioridad solo empuja
+# una entrada nueva; las viejas se descartan al salir sin volver a expandirse.
+# Así un nodo sale a lo sumo una vez por cada mejora real de su costo.
+#
+# Los empates de prioridad se rompen según `tie_break`:
+#   'deep'    -> primero el de mayor g (el más profundo; lo usual en A*)
+#   'shallow' -> primero el de menor g
+#   'fifo'    -> en orden de llegada
+#   'lifo'    -> el último que llegó
+#   None      -> sin criterio propio (desempata el elemento mismo)
+
+DEEP, SHALLOW, FIFO, LIFO = 'deep', 'shallow', 'fifo', 'lifo'
+TIE_BREAKS = (DEEP, SHALLOW, FIFO, LIFO, None)
+
+
+class Frontier:
+    __slots__ = ('heap', 'entries', 'tie_break', 'pushes', 'pops', 'stale', '_count',
+                 '_sign', '_sequence')
+
+    def __init__(self, tie_break=DEEP):
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f'Desempate desconocido: {tie_break!r} '
+                             f'(opciones: {", ".join(map(str, TIE_BREAKS))})')
+        self.heap = []
+        self.entries = {}    # elemento -> entrada vigente en el heap
+        self.tie_break = tie_break
+        self.pushes = 0
+        self.pops = 0
+        self.stale = 0       # entradas obsoletas descartadas
+        self._count = 0
+        # tie = g * signo, o el número de llegada * signo en fifo/lifo
+        self._sign = {DEEP: -1, SHALLOW: 1, FIFO: 1, LIFO: -1, None: 0}[tie_break]
+        self._sequence = tie_break in (FIFO, LIFO)
+
+    def push(self, item, priority, g=0):
+        # Inserta o mejora (decrease-key perezoso) la prioridad de item
+        if self._sequence:
+            self._count += 1
+            tie = self._count * self._sign
+        else:
+            tie = g * self._sign
+        entry = (priority, tie, item)
+        self.entries[item] = entry
+        heapq.heappush(self.heap, entry)
+        self.pushes += 1
+
+    def _skip_stale(self):
+        heap, entries = self.heap, self.entries
+        while heap:
+            entry = heap[0]
+            if entries.get(entry[2]) is entry:
+                return entry
+            heapq.heappop(heap)
+            self.stale += 1
+        return None
+
+    def pop(self):
+        # Saca el elemento de menor prioridad: (elemento, prioridad)
+        heap, entries = self.heap, self.entries
+        while heap:
+            entry = heapq.heappop(heap)
+            item = entry[2]
+            if entries.get(item) is entry:
+                del entries[item]
+                self.pops += 1
+                return item, entry[0]
+            self.stale += 1
+        raise IndexError('pop de una frontera vacía')
+
+    def peek(self):
+        # (elemento, prioridad) del mínimo sin sacarlo, o (None, None) si está vacía
+        entry = self._skip_stale()
+        if entry is None:
+            return None, None
+        return entry[2], entry[0]
+
+    def remove(self, item):
+        # Borrado perezoso: su entrada queda en el heap y se descarta al salir
+        self.entries.pop(item, None)
+
+    def priority(self, item):
+        entry = self.entries.get(item)
+        return None if entry is None else entry[0]
+
+    def clear(self):
+        self.heap.clear()
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
@@ -0,0 +1,249 @@
+import json
+import random
+
+# Representación compacta del laberinto: un bytearray plano con una celda por
+# byte (índice = fila * cols + columna) y una máscara de 4 bits por celda con
+# los movimientos válidos. Las búsquedas recorren vecinos con
+# grid.moves[grid.mask[i]], que ya trae los desplazamientos precalculados, así
+# que no hay que construir tuplas ni comprobar límites en cada expansión.
+# El costo de terreno (cuánto cuesta entrar a una celda) va en otro bytearray
+# paralelo, grid.costs; mientras todo cueste 1 queda en None y las búsquedas
+# usan costo unitario sin consultarlo.
+
+EMPTY, OBSTACLE, START, GOAL = 0, 1, 2, 3
+
+# Los costos de terreno son enteros pequeños (un byte por celda)
+MAX_COST = 255
+
+# Mismo orden que el get_neighbors original: arriba, abajo, izquierda, derecha
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Tabla de traducción byte -> 1 si la celda es transitable, 0 si es obstáculo
+_PASSABLE = bytes(0 if b == OBSTACLE else 1 for b in range(256))
+
+
+class Grid:
+    __slots__ = ('rows', 'cols', 'cells', 'mask', 'costs', 'offsets', 'moves',
+                 'version', 'derived', '_listeners')
+
+    def __init__(self, rows, cols, cells=None, mask=None, costs=None):
+        # cells (y mask) pueden ser cualquier búfer de bytes modificable, por
+        # ejemplo una vista sobre un archivo mapeado en memoria (binario.py)
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(rows * cols) if cells is None else cells
+        if len(self.cells) != rows * cols:
+            raise ValueError(f'Se esperaban {rows * cols} celdas y llegaron {len(self.cells)}')
+        if costs is not None and len(costs) != rows * cols:
+            raise ValueError(f'Se esperaban {rows * cols} costos y llegaron {len(costs)}')
+        self.costs = costs
+        self.offsets = (-cols, cols, -1, 1)
+        self.moves = tuple(
+            tuple(self.offsets[d] for d in range(4) if m >> d & 1) for m in range(16))
+        # Cambia cada vez que una celda pasa de libre a obstáculo o al revés;
+        # las cachés la usan como llave para saber si siguen siendo válidas
+        self.version = 0
+        # Estructuras derivadas (planificadores, índices) que viven con el grid
+        self.derived = {}
+        self._listeners = []
+        if mask is None:
+            self._build_masks()
+        elif len(mask) != rows * cols:
+            raise ValueError(f'Se esperaban {rows * cols} máscaras y llegaron {len(mask)}')
+        else:
+            self.mask = mask
+
+    @classmethod
+    def from_rows(cls, maze):
+        rows, cols = len(maze), len(maze[0])
+        cells = bytearray(rows * cols)
+        for r, fila in enumerate(maze):
+            cells[r * cols:(r + 1) * cols] = bytes(fila)
+        return cls(rows, cols, cells)
+
+    @classmethod
+    def random(cls, rows, cols, density, seed=None, keep_free=()):
+        # Laberinto aleatorio reproducible: cada celda es obstáculo con
+        # probabilidad `density`; las posiciones de keep_free quedan libres.
+        rng = random.Random(seed)
+        cells = bytearray(OBSTACLE if rng.random() < density else EMPTY
+                          for _ in range(rows * cols))
+        for r, c in keep_free:
+            cells[r * cols + c] = EMPTY
+        return cls(rows, cols, cells)
+
+    def _build_masks(self):
+        # Se calculan todas las máscaras a la vez tratando el laberinto como un
+        # entero gigante (un byte por celda) y desplazándolo; así el costo es
+        # lineal pero en C, incluso para mapas de millones de celdas.
+        rows, cols = self.rows, self.cols
+        n = rows * cols
+        ancho = 8 * cols
+        todo = (1 << (8 * n)) - 1
+        libre = int.from_bytes(bytes(self.cells).translate(_PASSABLE), 'little')
+        no_primera = int.from_bytes((b'\x00' + b'\x01' * (cols - 1)) * rows, 'little')
+        no_ultima = int.from_bytes((b'\x01' * (cols - 1) + b'\x00') * rows, 'little')
+        arriba = (libre << ancho) & todo
+        abajo = libre >> ancho
+        izquierda = (libre << 8) & no_primera
+        derecha = (libre >> 8) & no_ultima
+        mask = arriba | abajo << 1 | izquierda << 2 | derecha << 3
+        self.mask = bytearray(mask.to_bytes(n, 'little'))
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def index(self, pos):
+        # Fuera de rango no se envuelve a la fila siguiente: es un error
+        r, c = pos
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError(f'{tuple(pos)} fuera del laberinto de {self.rows}x{self.cols}')
+        return r * self.cols + c
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def cell(self, pos):
+        return self.cells[pos[0] * self.cols + pos[1]]
+
+    def passable(self, index):
+        return self.cells[index] != OBSTACLE
+
+    def find(self, value):
+        # Índices de todas las celdas con ese valor (p. ej. GOAL: todas las metas)
+        datos = self.cells if isinstance(self.cells, bytearray) else bytes(self.cells)
+        encontrados = []
+        i = datos.find(value)
+        while i != -1:
+            encontrados.append(i)
+            i = datos.find(value, i + 1)
+        return encontrados
+
+    def neighbors(self, index):
+        return [index + off for off in self.moves[self.mask[index]]]
+
+    def cost(self, index):
+        # Costo de entrar a la celda
+        return 1 if self.costs is None else self.costs[index]
+
+    def set_cost(self, pos, value):
+        if not 1 <= value <= MAX_COST:
+            raise ValueError(f'El costo debe estar entre 1 y {MAX_COST}: {value}')
+        i = self.index(pos)
+        if self.costs is None:
+            if value == 1:
+                return 1
+            self.costs = bytearray(b'\x01') * len(self)
+        antes = self.costs[i]
+        self.costs[i] = value
+        if antes != value:
+            # Mismo valor antes y después: avisa que cambió el costo, no la celda
+            celda = self.cells[i]
+            for listener in self._listeners:
+                listener(i, celda, celda)
+        return antes
+
+    def max_cost(self):
+        return 1 if self.costs is None else max(self.costs)
+
+    def path_cost(self, path):
+        if self.costs is None:
+            return len(path)
+        costs, cols = self.costs, self.cols
+        return sum(costs[r * cols + c] for r, c in path)
+
+    def set_cell(self, pos, value):
+        i = self.index(pos)
+        antes = self.cells[i]
+        self.cells[i] = value
+        if (antes == OBSTACLE) != (value == OBSTACLE):
+            self._refresh_around(i, pos)
+            self.version += 1
+        if antes != value:
+            for listener in self._listeners:
+                listener(i, antes, value)
+        return antes
+
+    # Los planificadores incrementales e índices se suscriben para enterarse
+    # de cada celda modificada: listener(indice, valor_anterior, valor_nuevo).
+    # Un cambio de costo de terreno llega con valor_anterior == valor_nuevo.
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def drop_derived(self):
+        # Descarta planificadores/índices guardados (y sus suscripciones)
+        for estructura in self.derived.values():
+            close = getattr(estructura, 'close', None)
+            if close is not None:
+                close()
+        self.derived.clear()
+
+    def _refresh_around(self, i, pos):
+        # Solo cambia el bit que apunta hacia la celda modificada en cada vecino
+        libre = self.cells[i] != OBSTACLE
+        r, c = pos
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                j = nr * self.cols + nc
+                bit = 1 << (d ^ 1)  # dirección opuesta: arriba<->abajo, izq<->der
+                if libre:
+                    self.mask[j] |= bit
+                else:
+                    self.mask[j] &= ~bit & 0xF
+
+    def __reduce__(self):
+        # Al enviarlo a otro proceso solo viajan las celdas; máscaras, cachés
+        # y suscriptores se reconstruyen (o no) del otro lado
+        costs = None if self.costs is None else bytearray(self.costs)
+        return (Grid, (self.rows, self.cols, bytearray(self.cells), None, costs))
+
+    def to_rows(self):
+        cols = self.cols
+        return [list(self.cells[r * cols:(r + 1) * cols]) for r in range(self.rows)]
+
+    def copy(self):
+        costs = None if self.costs is None else bytearray(self.costs)
+        return Grid(self.rows, self.cols, bytearray(self.cells), None, costs)
+
+
+# --- Configuración en JSON (mismo esquema que maze_config.json) ---
+def from_config(config):
+    # Se llenan las celdas antes de crear el grid, así las máscaras se
+    # calculan una sola vez en lugar de refrescarlas por cada obstáculo
+    # Puede haber varias metas ("goals": [[fila, columna], ...]); todas quedan
+    # marcadas como GOAL y se devuelve "goal", o la primera si no está.
+    rows, cols = config['rows'], config['cols']
+    start = tuple(config['start'])
+    goals = [tuple(g) for g in config.get('goals', [])]
+    goal = goals[0] if goals and 'goal' not in config else tuple(config['goal'])
+    cells = bytearray(rows * cols)
+    cells[start[0] * cols + start[1]] = START
+    for r, c in [goal] + goals:
+        if not (0 <= r < rows and 0 <= c < cols):
+            raise IndexError(f'Meta fuera del laberinto: {[r, c]}')
+        cells[r * cols + c] = GOAL
+    for r, c in config.get('obstacles', []):
+        if not (0 <= r < rows and 0 <= c < cols):
+            raise IndexError(f'Obstáculo fuera del laberinto: {[r, c]}')
+        cells[r * cols + c] = OBSTACLE
+    grid = Grid(rows, cols, cells)
+    # Terreno opcional: [[fila, columna, costo], ...]; lo que no aparece cuesta 1
+    for r, c, cost in config.get('costs', []):
+        if not (0 <= r < rows and 0 <= c < cols):
+            raise IndexError(f'Costo fuera del laberinto: {[r, c]}')
+        grid.set_cost((r, c), cost)
+    return grid, start, goal
+
+
+def load_config(filename):
+    with open(filename, 'r') as file:
+        return from_config(json.load(file))
@@ -0,0 +1,182 @@
+import time
+
+from busqueda import SearchStats, drain, record_frontier, record_path
+from frontera import Frontier
+from grid import OBSTACLE
+
+# Replanificación incremental con D* Lite (Koenig y Likhachev, 2002).
+# La búsqueda va de la meta hacia el inicio y conserva g/rhs entre llamadas:
+# cuando una celda cambia (clic en la GUI) o el agente avanza, solo se
+# reparan los nodos cuya distancia a la meta se ve afectada, en vez de
+# repetir A* desde cero. Mover la meta invalida todo el árbol y reinicia.
+
+INF = float('inf')
+
+
+class DStarLite:
+    def __init__(self, grid, start, goal, observer=None):
+        self.grid = grid
+        self.observer = observer
+        self._pending = set()
+        grid.subscribe(self._on_cell_changed)
+        self._reset(grid.index(start), grid.index(goal))
+
+    def _reset(self, s, g):
+        self.start = s
+        self.goal = g
+        self.last = s
+        self.km = 0
+        self.g = {}
+        self.rhs = {g: 0}
+        # Las llaves ya traen su desempate (ver _key); la frontera no agrega criterio
+        self.open = Frontier(tie_break=None)
+        self._pending.clear()
+        self.open.push(g, (self._h(s, g), 0))
+
+    def close(self):
+        self.grid.unsubscribe(self._on_cell_changed)
+
+    def _on_cell_changed(self, index, antes, nuevo):
+        if (antes == OBSTACLE) != (nuevo == OBSTACLE):
+            self._pending.add(index)
+
+    def _h(self, a, b):
+        ar, ac = divmod(a, self.grid.cols)
+        br, bc = divmod(b, self.grid.cols)
+        return abs(ar - br) + abs(ac - bc)
+
+    def _key(self, u):
+        # k1 como en el artículo. En los empates de k1 los nodos subconsistentes
+        # (g < rhs) van primero y por menor g, como en D* Lite original; los
+        # demás van por mayor g, hacia el inicio, como A* con desempate 'deep'.
+        # Así el primer plan no recorre toda la meseta de f. Cortar con un nodo
+        # sobreconsistente de igual k1 en la cima es seguro: no puede bajar g
+        # del inicio por debajo de k1.
+        g, rhs = self.g.get(u, INF), self.rhs.get(u, INF)
+        m = min(g, rhs)
+        k1 = m + self._h(self.start, u) + self.km
+        if g < rhs:
+            return (k1, 0, m)
+        return (k1, 1, -m)
+
+    def _update_vertex(self, u, stats):
+        grid = self.grid
+        if u != self.goal:
+            if grid.cells[u] == OBSTACLE:
+                self.rhs.pop(u, None)
+            else:
+                g = self.g
+                best = min((g.get(u + off, INF) for off in grid.moves[grid.mask[u]]),
+                           default=INF) + 1
+                if best == INF:
+                    self.rhs.pop(u, None)
+                else:
+                    self.rhs[u] = best
+        self.open.remove(u)
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self.open.push(u, self._key(u))
+            stats.generated += 1
+
+    def _compute_shortest_path(self, stats, step):
+        g, rhs, open_ = self.g, self.rhs, self.open
+        grid = self.grid
+        observer = self.observer
+        tramo = step
+        while True:
+            if tramo:
+                tramo -= 1
+                if not tramo:
+                    tramo = step
+                    yield stats
+            u, k_old = open_.peek()
+            if u is None:
+                break
+            if not (k_old < self._key(self.start) or
+                    rhs.get(self.start, INF) != g.get(self.start, INF)):
+                break
+            open_.pop()
+            stats.expanded += 1
+            if observer is not None:
+                observer('expand', grid.position(u))
+
+            k_new = self._key(u)
+            vecinos = grid.neighbors(u)
+            if k_old < k_new:
+                open_.push(u, k_new)
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                if observer is not None:
+                    observer('visit', grid.position(u))
+                for s in vecinos:
+                    self._update_vertex(s, stats)
+            else:
+                g.pop(u, None)
+                self._update_vertex(u, stats)
+                for s in vecinos:
+                    self._update_vertex(s, stats)
+            if len(open_) > stats.max_frontier:
+                stats.max_frontier = len(open_)
+
+    def move_start(self, start):
+        s = self.grid.index(start)
+        if s != self.start:
+            self.km += self._h(self.last, s)
+            self.last = s
+            self.start = s
+
+    def set_goal(self, goal):
+        g = self.grid.index(goal)
+        if g != self.goal:
+            self._reset(self.start, g)
+
+    def plan(self, start=None):
+        return drain(self.iter_plan(start, 0))
+
+    def iter_plan(self, start=None, step=1):
+        stats = SearchStats('d_star_lite')
+        inicio = time.perf_counter()
+        # La frontera vive entre llamadas; sus contadores se miden por llamada
+        self.open.pushes = self.open.pops = self.open.stale = 0
+        if start is not None:
+            self.move_start(start)
+        if self._pending:
+            for i in self._pending:
+                self._update_vertex(i, stats)
+                for s in self.grid.neighbors(i):
+                    self._update_vertex(s, stats)
+            self._pending.clear()
+        yield from self._compute_shortest_path(stats, step)
+        record_frontier(stats, self.open)
+        return record_path(self.grid, stats, self._extract_path(), inicio)
+
+    def _extract_path(self):
+        grid, g = self.grid, self.g
+        if g.get(self.start, INF) == INF:
+            return []
+        path = []
+        current = self.start
+        for _ in range(len(grid)):
+            if current == self.goal:
+                return path
+            current = min(grid.neighbors(current), key=lambda s: g.get(s, INF))
+            path.append(grid.position(current))
+        return []
+
+
+def iter_d_star_lite(grid, start, goal, observer=None, step=1):
+    # Interfaz de estrategia: reutiliza el planificador guardado en el grid,
+    # de modo que llamadas sucesivas sobre el mismo laberinto son incrementales.
+    planner = grid.derived.get('d_star_lite')
+    if planner is None:
+        planner = grid.derived['d_star_lite'] = DStarLite(grid, start, goal)
+    else:
+        planner.set_goal(goal)
+    planner.observer = observer
+    try:
+        return (yield from planner.iter_plan(start, step))
+    finally:
+        planner.observer = None
+
+
+def d_star_lite(grid, start, goal, observer=None):
+    return drain(iter_d_star_lite(grid, start, goal, observer, 0))
@@ -0,0 +1,332 @@
+import time
+
+from busqueda import SearchStats, drain, index_heuristic, record_frontier, record_path
+from frontera import Frontier
+from grid import DOWN, LEFT, OBSTACLE, RIGHT, UP
+
+# Búsqueda jerárquica (HPA*, Botea, Müller y Schaeffer, 2004). El laberinto
+# se parte en clusters cuadrados; en cada borde entre dos clusters vecinos los
+# tramos de celdas libres a ambos lados son entradas, y cada entrada aporta
+# un par de nodos (uno por lado). Dentro de cada cluster se precalcula la
+# distancia entre sus nodos. Una consulta conecta inicio y meta a los nodos de
+# su cluster, busca en ese grafo abstracto (mucho más chico que la grilla) y
+# solo después refina, celda por celda, los tramos del camino elegido.
+#
+# El grafo vive en grid.derived y escucha los cambios del grid: al cambiar una
+# celda solo se marca su cluster, y en la próxima consulta se recalculan sus
+# cuatro bordes y sus distancias internas (y las de un vecino si sus entradas
+# cambiaron). El camino es casi óptimo: puede ser algo más largo que el de A*.
+
+CLUSTER_SIZE = 16
+# Tramos de entrada de este largo o más llevan dos transiciones, una en cada
+# punta; los más cortos, una sola al medio
+TRAMO_LARGO = 6
+
+
+class ClusterGraph:
+    def __init__(self, grid, size=CLUSTER_SIZE):
+        self.grid = grid
+        self.size = size
+        self.crows = -(-grid.rows // size)
+        self.ccols = -(-grid.cols // size)
+        self.borders = {}   # (cluster, cluster vecino) -> [(celda, celda del otro lado)]
+        self.nodes = {}     # cluster -> nodos (índices de celda) en sus bordes
+        self.inter = {}     # nodo -> {nodo del cluster vecino: costo}
+        self.intra = {}     # cluster -> {nodo: {nodo del mismo cluster: costo}}
+        self.rebuilt = 0    # clusters recalculados desde que se creó
+        self._moves = {}    # ancho de cluster -> tabla de desplazamientos locales
+        self._dirty = set(range(self.crows * self.ccols))
+        grid.subscribe(self._on_cell_changed)
+
+    def close(self):
+        self.grid.unsubscribe(self._on_cell_changed)
+
+    def _on_cell_changed(self, index, antes, nuevo):
+        # Obstáculos y costos de terreno: en ambos casos basta con su cluster
+        self._dirty.add(self.cluster_of(index))
+
+    def cluster_of(self, index):
+        r, c = divmod(index, self.grid.cols)
+        return (r // self.size) * self.ccols + c // self.size
+
+    def _bounds(self, cluster):
+        cr, cc = divmod(cluster, self.ccols)
+        r0, c0 = cr * self.size, cc * self.size
+        return r0, min(r0 + self.size, self.grid.rows), c0, min(c0 + self.size, self.grid.cols)
+
+    def _borders_of(self, cluster):
+        cr, cc = divmod(cluster, self.ccols)
+        if cc + 1 < self.ccols:
+            yield (cluster, cluster + 1)
+        if cr + 1 < self.crows:
+            yield (cluster, cluster + self.ccols)
+        if cc > 0:
+            yield (cluster - 1, cluster)
+        if cr > 0:
+            yield (cluster - self.ccols, cluster)
+
+    def _transitions(self, a, b):
+        # Pares (celda en a, celda en b) a través del borde entre a y b
+        grid = self.grid
+        cells, cols = grid.cells, grid.cols
+        r0, r1, c0, c1 = self._bounds(a)
+        if b == a + self.ccols:   # b abajo: se recorre la fila del borde
+            linea = [((r1 - 1) * cols + c, r1 * cols + c) for c in range(c0, c1)]
+        else:                     # b a la derecha: se recorre la columna del borde
+            linea = [(r * cols + c1 - 1, r * cols + c1) for r in range(r0, r1)]
+        pares, tramo = [], []
+        for ia, ib in linea + [(None, None)]:
+            if ia is not None and cells[ia] != OBSTACLE and cells[ib] != OBSTACLE:
+                tramo.append((ia, ib))
+                continue
+            if len(tramo) >= TRAMO_LARGO:
+                pares += [tramo[0], tramo[-1]]
+            elif tramo:
+                pares.append(tramo[len(tramo) // 2])
+            tramo = []
+        return pares
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        grid = self.grid
+        afectados = set(dirty)
+        for key in {key for cluster in dirty for key in self._borders_of(cluster)}:
+            viejos = self.borders.get(key, [])
+            nuevos = self._transitions(*key)
+            if nuevos != viejos:
+                for ia, ib in viejos:
+                    self._unlink(ia, ib)
+                    self._unlink(ib, ia)
+                self.borders[key] = nuevos
+                afectados.update(key)
+            # Aunque las transiciones sean las mismas, el costo de entrar a sus
+            # celdas pudo cambiar: se reescribe siempre
+            for ia, ib in nuevos:
+                self.inter.setdefault(ia, {})[ib] = grid.cost(ib)
+                self.inter.setdefault(ib, {})[ia] = grid.cost(ia)
+        for cluster in afectados:
+            nodos = set()
+            for key in self._borders_of(cluster):
+                lado = 0 if key[0] == cluster else 1
+                nodos.update(par[lado] for par in self.borders.get(key, ()))
+            self.nodes[cluster] = nodos
+            internas = {}
+            for nodo in nodos:
+                internas[nodo] = self._dijkstra(nodo, cluster, nodos - {nodo})
+            self.intra[cluster] = internas
+            self.rebuilt += 1
+
+    def _unlink(self, a, b):
+        vecinos = self.inter.get(a)
+        if vecinos is not None:
+            vecinos.pop(b, None)
+            if not vecinos:
+                del self.inter[a]
+
+    def _local(self, cluster):
+        # Vista del cluster como grilla propia: máscaras recortadas en sus
+        # bordes e índices locales, así las búsquedas internas no tienen que
+        # comprobar en cada paso si se salen del cluster
+        grid = self.grid
+        cols = grid.cols
+        r0, r1, c0, c1 = self._bounds(cluster)
+        w = c1 - c0
+        lmask = bytearray()
+        for r in range(r0, r1):
+            lmask += grid.mask[r * cols + c0:r * cols + c1]
+        n = len(lmask)
+        for l in range(w):
+            lmask[l] &= ~(1 << UP) & 0xF
+            lmask[n - w + l] &= ~(1 << DOWN) & 0xF
+        for l in range(0, n, w):
+            lmask[l] &= ~(1 << LEFT) & 0xF
+            lmask[l + w - 1] &= ~(1 << RIGHT) & 0xF
+        moves = self._moves.get(w)
+        if moves is None:
+            offsets = (-w, w, -1, 1)
+            moves = self._moves[w] = tuple(
+                tuple(offsets[d] for d in range(4) if m >> d & 1) for m in range(16))
+        return r0, c0, w, lmask, moves
+
+    def _dijkstra(self, source, cluster, wanted, reverse=False):
+        # Costos desde source (o hacia source con reverse) hasta las celdas de
+        # wanted sin salir del cluster; termina cuando todas tienen costo final
+        grid = self.grid
+        cols = grid.cols
+        r0, c0, w, lmask, moves = self._local(cluster)
+
+        def local(i):
+            r, c = divmod(i, cols)
+            return (r - r0) * w + c - c0
+
+        objetivos = {local(i): i for i in wanted}
+        faltan = len(objetivos)
+        dist = [-1] * len(lmask)
+        ls = local(source)
+        dist[ls] = 0
+        encontrados = {}
+        if grid.costs is None:
+            # Sin terreno todo paso cuesta 1 y alcanza con un BFS
+            queue = [ls]
+            for u in queue:
+                if u in objetivos:
+                    encontrados[objetivos[u]] = dist[u]
+                    faltan -= 1
+                    if not faltan:
+                        break
+                d = dist[u] + 1
+                for off in moves[lmask[u]]:
+                    v = u + off
+                    if dist[v] < 0:
+                        dist[v] = d
+                        queue.append(v)
+            return encontrados
+        costs = grid.costs
+        lcost = bytearray()
+        for r in range(r0, r0 + len(lmask) // w):
+            lcost += costs[r * cols + c0:r * cols + c0 + w]
+        frontier = Frontier(tie_break=None)
+        frontier.push(ls, 0)
+        while frontier:
+            u, d = frontier.pop()
+            if u in objetivos:
+                encontrados[objetivos[u]] = d
+                faltan -= 1
+                if not faltan:
+                    break
+            # Hacia source se paga la celda de la que se viene, no la siguiente
+            for off in moves[lmask[u]]:
+                v = u + off
+                nd = d + (lcost[u] if reverse else lcost[v])
+                if dist[v] < 0 or nd < dist[v]:
+                    dist[v] = nd
+                    frontier.push(v, nd)
+        return encontrados
+
+    def _local_path(self, u, v, cluster, stats):
+        # Refinamiento: A* de u a v sin salir del cluster (índices, sin u)
+        grid = self.grid
+        cols, mask, moves = grid.cols, grid.mask, grid.moves
+        r0, r1, c0, c1 = self._bounds(cluster)
+        h = index_heuristic(grid, grid.position(v))
+        came_from = {u: None}
+        cost_so_far = {u: 0}
+        frontier = Frontier()
+        frontier.push(u, h(u), 0)
+        while frontier:
+            current, _ = frontier.pop()
+            stats.expanded += 1
+            if current == v:
+                break
+            for off in moves[mask[current]]:
+                vecino = current + off
+                r, c = divmod(vecino, cols)
+                if not (r0 <= r < r1 and c0 <= c < c1):
+                    continue
+                new_cost = cost_so_far[current] + grid.cost(vecino)
+                if new_cost < cost_so_far.get(vecino, new_cost + 1):
+                    cost_so_far[vecino] = new_cost
+                    came_from[vecino] = current
+                    frontier.push(vecino, new_cost + h(vecino), new_cost)
+                    stats.generated += 1
+        record_frontier(stats, frontier)
+        tramo = []
+        while v != u:
+            tramo.append(v)
+            v = came_from[v]
+        tramo.reverse()
+        return tramo
+
+    def plan(self, start, goal, observer=None):
+        return drain(self.iter_plan(start, goal, observer, 0))
+
+    def iter_plan(self, start, goal, observer=None, step=1):
+        stats = SearchStats('hpa_star')
+        inicio = time.perf_counter()
+        grid = self.grid
+        s, g = grid.index(start), grid.index(goal)
+        if s == g or grid.cells[s] == OBSTACLE or grid.cells[g] == OBSTACLE:
+            return record_path(grid, stats, [], inicio)
+        self._refresh()
+
+        # Inicio y meta se enganchan temporalmente a los nodos de su cluster
+        cs, cg = self.cluster_of(s), self.cluster_of(g)
+        destinos = self.nodes[cs] | {g} if cs == cg else self.nodes[cs]
+        salida = self._dijkstra(s, cs, destinos - {s})
+        llegada = self._dijkstra(g, cg, self.nodes[cg] - {g}, reverse=True)
+
+        h = index_heuristic(grid, goal)
+        frontier = Frontier()
+        frontier.push(s, h(s), 0)
+        came_from = {s: None}
+        cost_so_far = {s: 0}
+
+        tramo = step
+        while frontier:
+            if tramo:
+                tramo -= 1
+                if not tramo:
+                    tramo = step
+                    yield stats
+            current, _ = frontier.pop()
+            stats.expanded += 1
+            if observer is not None:
+                observer('expand', grid.position(current))
+            if current == g:
+                break
+
+            if current == s:
+                aristas = list(salida.items())
+            else:
+                aristas = list(self.intra[self.cluster_of(current)].get(current, {}).items())
+                if current in llegada:
+                    aristas.append((g, llegada[current]))
+            aristas += self.inter.get(current, {}).items()
+            g_actual = cost_so_far[current]
+            for vecino, costo in aristas:
+                new_cost = g_actual + costo
+                if new_cost < cost_so_far.get(vecino, new_cost + 1):
+                    cost_so_far[vecino] = new_cost
+                    came_from[vecino] = current
+                    frontier.push(vecino, new_cost + h(vecino), new_cost)
+                    stats.generated += 1
+                    if observer is not None:
+                        observer('visit', grid.position(vecino))
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+        record_frontier(stats, frontier)
+
+        if g not in came_from:
+            return record_path(grid, stats, [], inicio)
+        abstracto = [g]
+        while abstracto[-1] != s:
+            abstracto.append(came_from[abstracto[-1]])
+        abstracto.reverse()
+
+        # Refinamiento: los saltos entre clusters son celdas vecinas; los
+        # tramos dentro de un cluster se recorren con un A* acotado a él
+        path = []
+        for u, v in zip(abstracto, abstracto[1:]):
+            cluster = self.cluster_of(u)
+            if cluster != self.cluster_of(v):
+                path.append(v)
+            else:
+                path += self._local_path(u, v, cluster, stats)
+        return record_path(grid, stats, [grid.position(i) for i in path], inicio)
+
+
+def cluster_graph(grid):
+    graph = grid.derived.get('hpa')
+    if graph is None:
+        graph = grid.derived['hpa'] = ClusterGraph(grid)
+    return graph
+
+
+def iter_hpa_star(grid, start, goal, observer=None, step=1):
+    return (yield from cluster_graph(grid).iter_plan(start, goal, observer, step))
+
+
+def hpa_star(grid, start, goal, observer=None):
+    return drain(iter_hpa_star(grid, start, goal, observer, 0))
@@ -0,0 +1,127 @@
+import time
+
+from busqueda import SearchStats, drain, record_frontier, record_path
+from frontera import DEEP, Frontier
+from grid import OBSTACLE
+
+# Jump Point Search para grillas 4-conexas de costo uniforme.
+# Con solo cuatro movimientos se usa el orden canónico "vertical primero":
+# los saltos horizontales se detienen en la meta o ante un vecino forzado, y
+# los verticales además se detienen en cualquier celda desde la que un salto
+# horizontal encuentre algo. A* solo expande esos puntos de salto, así que en
+# mapas abiertos saca de la frontera una fracción mínima de las celdas.
+
+
+def iter_jump_point_search(grid, start, goal, observer=None, step=1, tie_break=DEEP):
+    stats = SearchStats('jump_point_search')
+    inicio = time.perf_counter()
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    gr, gc = goal
+
+    def walkable(r, c):
+        return 0 <= r < rows and 0 <= c < cols and cells[r * cols + c] != OBSTACLE
+
+    def jump_horizontal(r, c, dc):
+        while walkable(r, c):
+            if r == gr and c == gc:
+                return (r, c)
+            if ((walkable(r - 1, c) and not walkable(r - 1, c - dc)) or
+                    (walkable(r + 1, c) and not walkable(r + 1, c - dc))):
+                return (r, c)
+            c += dc
+        return None
+
+    def jump_vertical(r, c, dr):
+        while walkable(r, c):
+            if r == gr and c == gc:
+                return (r, c)
+            if ((walkable(r, c - 1) and not walkable(r - dr, c - 1)) or
+                    (walkable(r, c + 1) and not walkable(r - dr, c + 1))):
+                return (r, c)
+            if jump_horizontal(r, c + 1, 1) or jump_horizontal(r, c - 1, -1):
+                return (r, c)
+            r += dr
+        return None
+
+    def successors(node, parent):
+        r, c = node
+        if parent is None:
+            direcciones = ((-1, 0), (1, 0), (0, -1), (0, 1))
+        else:
+            dr = (r > parent[0]) - (r < parent[0])
+            dc = (c > parent[1]) - (c < parent[1])
+            if dc:
+                # Avance horizontal: seguir de frente o girar en vertical
+                direcciones = ((0, dc), (-1, 0), (1, 0))
+            else:
+                direcciones = ((dr, 0), (0, -1), (0, 1))
+        for dr, dc in direcciones:
+            if dc:
+                punto = jump_horizontal(r, c + dc, dc)
+            else:
+                punto = jump_vertical(r + dr, c, dr)
+            if punto is not None:
+                yield punto
+
+    def h(p):
+        return abs(p[0] - gr) + abs(p[1] - gc)
+
+    frontier = Frontier(tie_break)  # prioridad f; en empates, el más profundo
+    frontier.push(start, h(start), 0)
+    came_from = {start: None}
+    cost_so_far = {start: 0}
+
+    tramo = step
+    while frontier:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current, _ = frontier.pop()
+        g = cost_so_far[current]
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', current)
+
+        if current == goal:
+            break
+
+        for punto in successors(current, came_from[current]):
+            new_cost = g + abs(punto[0] - current[0]) + abs(punto[1] - current[1])
+            if punto not in cost_so_far or new_cost < cost_so_far[punto]:
+                cost_so_far[punto] = new_cost
+                came_from[punto] = current
+                frontier.push(punto, new_cost + h(punto), new_cost)
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', punto)
+        if len(frontier) > stats.max_frontier:
+            stats.max_frontier = len(frontier)
+
+    record_frontier(stats, frontier)
+    return record_path(grid, stats, _expand_jumps(came_from, start, goal), inicio)
+
+
+def jump_point_search(grid, start, goal, observer=None, tie_break=DEEP):
+    return drain(iter_jump_point_search(grid, start, goal, observer, 0, tie_break))
+
+
+def _expand_jumps(came_from, start, goal):
+    # Rellena los tramos rectos entre puntos de salto consecutivos
+    if goal not in came_from:
+        return []
+    path = []
+    current = goal
+    while current != start:
+        previo = came_from[current]
+        dr = (current[0] > previo[0]) - (current[0] < previo[0])
+        dc = (current[1] > previo[1]) - (current[1] < previo[1])
+        r, c = current
+        while (r, c) != previo:
+            path.append((r, c))
+            r -= dr
+            c -= dc
+        current = previo
+    path.reverse()
+    return path
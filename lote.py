@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import estrategias
+from binario import load_maze
+
+# Resolución por lotes: miles de trabajos (laberinto, inicio, meta, algoritmo)
+# repartidos en un ProcessPoolExecutor. Los laberintos se envían una sola vez
+# a cada proceso en el inicializador del pool; cada trabajo solo lleva la
+# llave del laberinto y dos coordenadas, así que no se vuelve a serializar la
+# grilla por trabajo. Los resultados salen en el mismo orden de entrada, a
+# medida que están listos.
+#
+#   python lote.py --configs a.json b.json --algorithm astar
+#   python lote.py --queries consultas.jsonl --workers 8 --out resultados.jsonl
+#
+# Cada línea de consultas.jsonl es un objeto como
+#   {"maze": "maze_config.json", "start": [2, 0], "goal": [1, 3], "algorithm": "bfs"}
+# donde start, goal y algorithm son opcionales (por defecto los del archivo).
+# Una consulta inválida (laberinto que no carga, celda que no es [fila,
+# columna] de enteros o cae fuera del laberinto, estrategia desconocida) o
+# una búsqueda que falla no cortan el lote: su línea de salida trae "error".
+
+_GRIDS = {}
+_ERRORES_CARGA = (OSError, ValueError, KeyError, IndexError, TypeError)
+
+
+def _init_worker(grids):
+    _GRIDS.update(grids)
+
+
+def _run_job(job):
+    key, start, goal, algorithm, error = job
+    if error is None:
+        grid = _GRIDS[key]
+        try:
+            path, stats = estrategias.solve(grid, start, goal, algorithm)
+        except Exception as e:  # un trabajo que falla no debe cortar el lote
+            error = f'{type(e).__name__}: {e}'
+    if error is not None:
+        return {'maze': key, 'start': start and list(start), 'goal': goal and list(goal),
+                'algorithm': algorithm, 'found': False, 'error': error}
+    return {
+        'maze': key,
+        'start': list(start),
+        'goal': list(goal),
+        'algorithm': algorithm,
+        'found': bool(path),
+        'cost': grid.path_cost(path),
+        'path': [list(p) for p in path],
+        'stats': stats.as_dict(),
+    }
+
+
+def solve_batch(grids, jobs, workers=None, chunksize=16):
+    # grids: llave -> Grid; jobs: iterable de (llave, start, goal, algoritmo,
+    # error), donde error es None o el motivo por el que el trabajo no se corre.
+    # Devuelve un generador de resultados en el orden de los trabajos.
+    if workers == 1:
+        _init_worker(grids)
+        for job in jobs:
+            yield _run_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(grids,)) as pool:
+        yield from pool.map(_run_job, jobs, chunksize=chunksize)
+
+
+def jobs_from_configs(filenames, algorithm):
+    grids, jobs = {}, []
+    for filename in filenames:
+        try:
+            grid, start, goal = load_maze(filename)
+        except _ERRORES_CARGA as e:
+            jobs.append((filename, None, None, algorithm, f'No se pudo cargar {filename}: {e}'))
+            continue
+        grids[filename] = grid
+        jobs.append((filename, start, goal, algorithm, _check(grid, start, goal, algorithm)))
+    return grids, jobs
+
+
+def _celda(consulta, campo, default):
+    valor = consulta.get(campo)
+    if valor is None:
+        return default
+    if not (isinstance(valor, list) and len(valor) == 2
+            and all(isinstance(x, int) for x in valor)):
+        raise ValueError(f'"{campo}" debe ser [fila, columna]: {valor!r}')
+    return tuple(valor)
+
+
+def _check(grid, start, goal, algorithm):
+    # Motivo por el que una consulta no se puede correr, o None
+    if algorithm not in estrategias.STRATEGIES:
+        return f'Estrategia desconocida: {algorithm!r}'
+    for nombre, pos in (('inicio', start), ('meta', goal)):
+        if not grid.in_bounds(pos):
+            return f'{nombre} {list(pos)} fuera del laberinto de {grid.rows}x{grid.cols}'
+    return None
+
+
+def jobs_from_queries(filename, algorithm):
+    grids, defaults, jobs = {}, {}, []
+    with open(filename) as file:
+        for linea in file:
+            if not linea.strip():
+                continue
+            try:
+                consulta = json.loads(linea)
+                key = consulta['maze']
+                if key not in grids and key not in defaults:
+                    try:
+                        grids[key], *defaults[key] = load_maze(key)
+                    except _ERRORES_CARGA as e:
+                        defaults[key] = f'No se pudo cargar {key}: {e}'
+                alg = consulta.get('algorithm', algorithm)
+                if isinstance(defaults[key], str):
+                    jobs.append((key, None, None, alg, defaults[key]))
+                    continue
+                start = _celda(consulta, 'start', defaults[key][0])
+                goal = _celda(consulta, 'goal', defaults[key][1])
+                error = _check(grids[key], start, goal, alg)
+            except (ValueError, KeyError, TypeError) as e:
+                jobs.append((None, None, None, None, f'Consulta inválida: {e}'))
+                continue
+            jobs.append((key, start, goal, alg, error))
+    return grids, jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resolución de laberintos por lotes.')
+    fuente = parser.add_mutually_exclusive_group(required=True)
+    fuente.add_argument('--configs', nargs='+', help='archivos con el esquema de maze_config.json')
+    fuente.add_argument('--queries', help='archivo JSON lines con una consulta por línea')
+    parser.add_argument('--algorithm', default='astar', choices=list(estrategias.STRATEGIES))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--out', help='archivo de salida (por defecto la salida estándar)')
+    args = parser.parse_args(argv)
+
+    if args.configs:
+        grids, jobs = jobs_from_configs(args.configs, args.algorithm)
+    else:
+        grids, jobs = jobs_from_queries(args.queries, args.algorithm)
+
+    out = open(args.out, 'w') if args.out else sys.stdout
+    try:
+        for resultado in solve_batch(grids, jobs, args.workers, args.chunksize):
+            out.write(json.dumps(resultado) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from benchmark import percentile
+from campos import UNREACHABLE, DistanceFieldCache
+from frontera import Frontier
+from grid import Grid, OBSTACLE
+
+# Varios agentes en el mismo laberinto con A* cooperativo por ventanas
+# (WHCA*, Silver 2005). En cada tick se planifican todos los agentes en una
+# sola llamada, uno tras otro por prioridad; cada uno busca en espacio-tiempo
+# (celda, instante) y reserva en una tabla las celdas y los pasos que usa
+# durante los próximos `window` instantes, de modo que los siguientes lo
+# esquivan: nadie termina en la celda de otro ni se cruzan de frente.
+#
+# La heurística de cada agente es la distancia exacta a su meta ignorando a
+# los demás, sacada de un campo de distancias (campos.py). Los agentes con la
+# misma meta comparten el mismo campo, que se calcula una sola vez mientras
+# el laberinto no cambie. Aquí cada paso (o espera) dura un tick: los costos
+# de terreno no se consideran.
+#
+#   python multiagente.py --agents 10 50 100 200 --size 64 --ticks 40
+
+WINDOW = 16
+
+
+class TickStats:
+    __slots__ = ('agents', 'expanded', 'fields', 'waits', 'blocked', 'elapsed')
+
+    def __init__(self, agents):
+        self.agents = agents
+        self.expanded = 0     # estados (celda, instante) expandidos en total
+        self.fields = 0       # campos de distancia calculados (no estaban en caché)
+        self.waits = 0        # agentes que este tick se quedan en su celda
+        self.blocked = 0      # agentes sin plan libre de conflictos en la ventana
+        self.elapsed = 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CooperativePlanner:
+    def __init__(self, grid, window=WINDOW, max_goals=64):
+        self.grid = grid
+        self.window = window
+        self.fields = DistanceFieldCache(grid, capacity=max_goals)
+        self.latencies = []   # segundos de cada plan_tick
+
+    def plan_tick(self, positions, goals):
+        # positions, goals: listas paralelas de (fila, columna). Devuelve, por
+        # agente, su plan de `window` posiciones (una por instante futuro), o
+        # uno más corto si no hay cómo seguir sin chocar durante toda la ventana.
+        inicio = time.perf_counter()
+        grid = self.grid
+        n, window = len(grid), self.window
+        stats = TickStats(len(positions))
+        misses = self.fields.misses
+        actuales = [grid.index(p) for p in positions]
+        campos = [self.fields.field(g) for g in goals]
+        # Reservas: celda ocupada en el instante t -> t * n + celda; paso de a a
+        # b entre t - 1 y t -> (t * n + a) * n + b. Mientras un agente no se
+        # planifica, su celda actual queda reservada para el instante 1: si
+        # después no encuentra por dónde moverse, al menos puede esperar ahí.
+        celdas = {n + i for i in actuales}
+        pasos = set()
+
+        # Primero los que están más lejos de su meta: son los que más se
+        # retrasan si tienen que esquivar
+        def lejania(k):
+            d = campos[k][actuales[k]]
+            return (-1 if d == UNREACHABLE else -d, k)
+        planes = [None] * len(positions)
+        for k in sorted(range(len(positions)), key=lejania):
+            celdas.discard(n + actuales[k])
+            plan = self._space_time_a_star(actuales[k], grid.index(goals[k]), campos[k],
+                                           celdas, pasos, stats)
+            if len(plan) < window:
+                stats.blocked += 1
+            previa = actuales[k]
+            for t, celda in enumerate(plan, 1):
+                celdas.add(t * n + celda)
+                pasos.add((t * n + previa) * n + celda)
+                previa = celda
+            if plan[0] == actuales[k]:
+                stats.waits += 1
+            planes[k] = [grid.position(i) for i in plan]
+        stats.fields = self.fields.misses - misses
+        stats.elapsed = time.perf_counter() - inicio
+        self.latencies.append(stats.elapsed)
+        return planes, stats
+
+    def _space_time_a_star(self, s, g, dist, celdas, pasos, stats):
+        # A* sobre estados t * n + celda hasta la profundidad de la ventana.
+        # Moverse o esperar cuesta 1, salvo esperar sobre la meta (0), así que
+        # un agente que llega se queda ahí sin penalización. Si ningún camino
+        # cubre la ventana entera, devuelve el que llegó más lejos en el
+        # tiempo; el instante 1 siempre está libre para esperar (ver plan_tick).
+        if dist[s] == UNREACHABLE:
+            return [s]
+        grid = self.grid
+        n, window = len(grid), self.window
+        mask, moves = grid.mask, grid.moves
+        frontier = Frontier()
+        push, pop = frontier.push, frontier.pop
+        push(s, dist[s], 0)
+        came_from = {s: None}
+        cost_so_far = {s: 0}
+        mejor = s
+        while frontier:
+            estado, _ = pop()
+            stats.expanded += 1
+            t, celda = divmod(estado, n)
+            if t > mejor // n:
+                mejor = estado  # el más profundo en el tiempo
+                if t == window:
+                    break
+            g_actual = cost_so_far[estado]
+            base = (t + 1) * n
+            for off in moves[mask[celda]] + (0,):
+                vecino = celda + off
+                siguiente = base + vecino
+                # Ocupada en t + 1, o alguien viene de vecino a celda (cruce)
+                if siguiente in celdas or (base + vecino) * n + celda in pasos:
+                    continue
+                d = dist[vecino]
+                if d == UNREACHABLE:
+                    continue
+                new_cost = g_actual + (0 if off == 0 and celda == g else 1)
+                if siguiente not in cost_so_far or new_cost < cost_so_far[siguiente]:
+                    cost_so_far[siguiente] = new_cost
+                    came_from[siguiente] = estado
+                    push(siguiente, new_cost + d, new_cost)
+        plan = []
+        while mejor != s:
+            plan.append(mejor % n)
+            mejor = came_from[mejor]
+        plan.reverse()
+        return plan or [s]
+
+
+def simulate(grid, starts, goals, ticks, window=WINDOW):
+    # Avanza los agentes hasta `ticks` veces (un paso cada uno por tick). El
+    # que llega a su meta se retira del laberinto y deja la celda libre.
+    # Devuelve (posiciones finales, estadísticas de cada tick)
+    planner = CooperativePlanner(grid, window)
+    positions = list(starts)
+    historial = []
+    for _ in range(ticks):
+        activos = [k for k in range(len(positions)) if positions[k] != goals[k]]
+        if not activos:
+            break
+        planes, stats = planner.plan_tick([positions[k] for k in activos],
+                                          [goals[k] for k in activos])
+        for k, plan in zip(activos, planes):
+            positions[k] = plan[0]
+        historial.append(stats)
+    return positions, historial
+
+
+def random_agents(grid, count, goals, rng):
+    # Inicios distintos en celdas libres; las metas se reparten entre `goals`
+    libres = [i for i in range(len(grid)) if grid.cells[i] != OBSTACLE]
+    starts = [grid.position(i) for i in rng.sample(libres, count)]
+    return starts, [goals[k % len(goals)] for k in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Latencia por tick de A* cooperativo.')
+    parser.add_argument('--agents', type=int, nargs='+', default=[10, 50, 100, 200])
+    parser.add_argument('--size', type=int, default=64)
+    parser.add_argument('--density', type=float, default=0.2)
+    parser.add_argument('--goals', type=int, default=4, help='metas distintas entre los agentes')
+    parser.add_argument('--ticks', type=int, default=40)
+    parser.add_argument('--window', type=int, default=WINDOW)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for count in args.agents:
+        rng = random.Random(args.seed)
+        grid = Grid.random(args.size, args.size, args.density, seed=args.seed)
+        libres = [i for i in range(len(grid)) if grid.cells[i] != OBSTACLE]
+        goals = [grid.position(i) for i in rng.sample(libres, args.goals)]
+        starts, metas = random_agents(grid, count, goals, rng)
+        positions, historial = simulate(grid, starts, metas, args.ticks, args.window)
+        tiempos = [st.elapsed for st in historial]
+        llegaron = sum(p == g for p, g in zip(positions, metas))
+        print(f'{count:>5} agentes: tick mediana={statistics.median(tiempos) * 1e3:8.2f} ms '
+              f'p90={percentile(tiempos, 90) * 1e3:8.2f} ms '
+              f'por agente={statistics.median(tiempos) / count * 1e6:7.1f} us '
+              f'campos={sum(st.fields for st in historial)} '
+              f'bloqueados={sum(st.blocked for st in historial)} '
+              f'llegaron={llegaron}/{count}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
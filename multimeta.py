@@ -0,0 +1,257 @@
+import time
+from collections import deque
+
+from busqueda import SearchStats, drain, record_frontier, record_path
+from frontera import Frontier
+from grid import GOAL
+
+# Varias metas (varios quesos): en lugar de una búsqueda por meta, una sola
+# pasada encuentra la más cercana.
+#   - multi_source_search: BFS (o Dijkstra si hay terreno) que parte a la vez
+#     de todas las metas, hacia atrás, y se detiene al alcanzar el inicio; la
+#     meta desde la que llegó es la más cercana.
+#   - multi_goal_a_star: A* desde el inicio que termina en la primera meta que
+#     saca de la frontera, con heurística = distancia Manhattan a la meta más
+#     cercana (admisible y consistente: es el mínimo de heurísticas que lo
+#     son). Ese mínimo se consulta en un índice espacial de las metas.
+# Las metas son todas las celdas GOAL del grid más la meta pedida, así que
+# las estrategias caben en el registro con la firma de siempre.
+
+# Lado (en celdas) de las cubetas del índice espacial
+CUBETA = 8
+# Con pocas metas recorrerlas todas es más barato que consultar el índice
+METAS_SIN_INDICE = 8
+
+
+def grid_goals(grid, goal=None):
+    goals = grid.find(GOAL)
+    if goal is not None and grid.index(goal) not in goals:
+        goals.append(grid.index(goal))
+    return goals
+
+
+def _goal_indices(grid, goal, goals):
+    # Índices de las metas, sin repetidas ni obstáculos (una meta bloqueada
+    # no se puede alcanzar, igual que en bfs o a_star)
+    indices = grid_goals(grid, goal) if goals is None else map(grid.index, goals)
+    return [i for i in dict.fromkeys(indices) if grid.passable(i)]
+
+
+class GoalIndex:
+    # Metas repartidas en cubetas de CUBETA x CUBETA; la más cercana se busca
+    # en anillos de cubetas alrededor del punto, y se deja de buscar cuando el
+    # anillo siguiente ya no puede tener nada más cerca que lo encontrado
+    def __init__(self, grid, goals, size=CUBETA):
+        self.size = size
+        self.goals = [grid.position(i) for i in goals]
+        self.buckets = {}
+        for r, c in self.goals:
+            self.buckets.setdefault((r // size, c // size), []).append((r, c))
+        filas = [b[0] for b in self.buckets] or [0]
+        columnas = [b[1] for b in self.buckets] or [0]
+        self._limites = (min(filas), max(filas), min(columnas), max(columnas))
+
+    def nearest_distance(self, r, c):
+        size, buckets = self.size, self.buckets
+        br, bc = r // size, c // size
+        f0, f1, c0, c1 = self._limites
+        # Más allá de este anillo no hay cubetas con metas
+        ultimo = max(abs(br - f0), abs(br - f1), abs(bc - c0), abs(bc - c1))
+        mejor = None
+        for k in range(ultimo + 1):
+            # Toda meta en el anillo k está al menos a (k - 1) * size + 1
+            if mejor is not None and (k - 1) * size + 1 > mejor:
+                break
+            for fila in range(br - k, br + k + 1):
+                paso = 1 if abs(fila - br) == k else 2 * k
+                for col in range(bc - k, bc + k + 1, paso or 1):
+                    for gr, gc in buckets.get((fila, col), ()):
+                        d = abs(gr - r) + abs(gc - c)
+                        if mejor is None or d < mejor:
+                            mejor = d
+        return mejor
+
+    def heuristic(self, grid):
+        cols = grid.cols
+        if len(self.goals) <= METAS_SIN_INDICE:
+            goals = self.goals
+
+            def h(i):
+                r, c = divmod(i, cols)
+                return min(abs(r - gr) + abs(c - gc) for gr, gc in goals)
+            return h
+
+        def h(i):
+            r, c = divmod(i, cols)
+            return self.nearest_distance(r, c)
+        return h
+
+
+# --- BFS / Dijkstra desde todas las metas ---
+def iter_multi_source_search(grid, start, goal, observer=None, step=1, goals=None):
+    stats = SearchStats('multi_source_search')
+    inicio = time.perf_counter()
+    s = grid.index(start)
+    goals = _goal_indices(grid, goal, goals)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    # siguiente[v] = celda que sigue a v en el camino hacia su meta más cercana
+    siguiente = dict.fromkeys(goals)
+    llegada = None
+
+    tramo = step
+    if costs is None:
+        # Costo unitario: BFS por capas desde todas las metas a la vez
+        queue = deque(goals)
+        while queue:
+            if tramo:
+                tramo -= 1
+                if not tramo:
+                    tramo = step
+                    yield stats
+            current = queue.popleft()
+            stats.expanded += 1
+            if observer is not None:
+                observer('expand', position(current))
+            if current == s:
+                llegada = current
+                break
+            for off in moves[mask[current]]:
+                vecino = current + off
+                if vecino not in siguiente:
+                    siguiente[vecino] = current
+                    queue.append(vecino)
+                    stats.generated += 1
+                    if observer is not None:
+                        observer('visit', position(vecino))
+            if len(queue) > stats.max_frontier:
+                stats.max_frontier = len(queue)
+        stats.pushes, stats.pops = stats.generated + len(goals), stats.expanded
+    else:
+        # Con terreno, Dijkstra hacia atrás: ir de v a u cuesta costs[u], así
+        # que al retroceder de u a v se suma el costo de u
+        frontier = Frontier()
+        push, pop = frontier.push, frontier.pop
+        dist = dict.fromkeys(goals, 0)
+        for g in goals:
+            push(g, 0, 0)
+        while frontier:
+            if tramo:
+                tramo -= 1
+                if not tramo:
+                    tramo = step
+                    yield stats
+            current, d = pop()
+            stats.expanded += 1
+            if observer is not None:
+                observer('expand', position(current))
+            if current == s:
+                llegada = current
+                break
+            new_cost = d + costs[current]
+            for off in moves[mask[current]]:
+                vecino = current + off
+                if vecino not in dist or new_cost < dist[vecino]:
+                    dist[vecino] = new_cost
+                    siguiente[vecino] = current
+                    push(vecino, new_cost, new_cost)
+                    stats.generated += 1
+                    if observer is not None:
+                        observer('visit', position(vecino))
+            if len(frontier) > stats.max_frontier:
+                stats.max_frontier = len(frontier)
+        record_frontier(stats, frontier)
+
+    path = []
+    if llegada is not None:
+        current = siguiente[s]
+        while current is not None:
+            path.append(position(current))
+            current = siguiente[current]
+    return record_path(grid, stats, path, inicio)
+
+
+def multi_source_search(grid, start, goal, observer=None, goals=None):
+    return drain(iter_multi_source_search(grid, start, goal, observer, 0, goals))
+
+
+# --- A* hacia la meta más cercana ---
+def iter_multi_goal_a_star(grid, start, goal, observer=None, step=1, goals=None):
+    stats = SearchStats('multi_goal_a_star')
+    inicio = time.perf_counter()
+    s = grid.index(start)
+    goals = _goal_indices(grid, goal, goals)
+    metas = set(goals)
+    if not metas:
+        return record_path(grid, stats, [], inicio)
+    mask, moves, position = grid.mask, grid.moves, grid.position
+    costs = grid.costs
+    h = GoalIndex(grid, goals).heuristic(grid)
+    frontier = Frontier()
+    push, pop = frontier.push, frontier.pop
+    push(s, h(s), 0)
+    came_from = {s: None}
+    cost_so_far = {s: 0}
+    llegada = None
+
+    tramo = step
+    while frontier:
+        if tramo:
+            tramo -= 1
+            if not tramo:
+                tramo = step
+                yield stats
+        current, _ = pop()
+        stats.expanded += 1
+        if observer is not None:
+            observer('expand', position(current))
+        if current in metas:
+            llegada = current
+            break
+        g_actual = cost_so_far[current]
+        for off in moves[mask[current]]:
+            vecino = current + off
+            new_cost = g_actual + (1 if costs is None else costs[vecino])
+            if vecino not in cost_so_far or new_cost < cost_so_far[vecino]:
+                cost_so_far[vecino] = new_cost
+                came_from[vecino] = current
+                push(vecino, new_cost + h(vecino), new_cost)
+                stats.generated += 1
+                if observer is not None:
+                    observer('visit', position(vecino))
+        if len(frontier) > stats.max_frontier:
+            stats.max_frontier = len(frontier)
+
+    record_frontier(stats, frontier)
+    path = []
+    current = llegada
+    while current is not None and current != s:
+        path.append(position(current))
+        current = came_from[current]
+    path.reverse()
+    return record_path(grid, stats, path, inicio)
+
+
+def multi_goal_a_star(grid, start, goal, observer=None, goals=None):
+    return drain(iter_multi_goal_a_star(grid, start, goal, observer, 0, goals))
+
+
+def visiting_order(grid, start, goals):
+    # Orden de visita voraz: desde donde está, siempre a la meta pendiente más
+    # cercana (una búsqueda por tramo). Devuelve (metas en orden, camino
+    # completo); las metas inalcanzables quedan fuera.
+    pendientes = set(goals)
+    orden, camino = [], []
+    actual = start
+    if actual in pendientes:
+        pendientes.discard(actual)
+        orden.append(actual)
+    while pendientes:
+        tramo, _ = multi_goal_a_star(grid, actual, None, goals=pendientes)
+        if not tramo:
+            break
+        actual = tramo[-1]
+        pendientes.discard(actual)
+        orden.append(actual)
+        camino.extend(tramo)
+    return orden, camino
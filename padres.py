@@ -0,0 +1,66 @@
+# Registro compacto de visitados y padres para mapas enormes. En lugar del
+# diccionario came_from (índice -> índice del padre, más de 100 bytes por
+# celda visitada contando los enteros), guarda por celda un bit de "visitada"
+# y 2 bits con la dirección del paso que llegó a ella, en arreglos
+# preasignados: 3 bits por celda del mapa, unos 37 MB para 10k x 10k. El
+# padre se recupera restando el desplazamiento de esa dirección.
+#
+# Imita lo que las búsquedas usan del diccionario (`in`, came_from[hijo] =
+# padre, get), así que se puede pasar en su lugar; reconstruct_path lo
+# reconoce y decodifica el camino directamente.
+
+
+class ParentMap:
+    __slots__ = ('root', 'offsets', 'visited', 'dirs', '_dir_of')
+
+    def __init__(self, grid, root):
+        n = len(grid)
+        self.root = root
+        self.offsets = grid.offsets
+        self.visited = bytearray((n + 7) >> 3)
+        self.dirs = bytearray((n + 3) >> 2)
+        # Desplazamiento -> dirección; con una sola columna arriba e izquierda
+        # comparten desplazamiento, y cualquiera de las dos decodifica igual
+        self._dir_of = {off: d for d, off in enumerate(self.offsets)}
+        self.visited[root >> 3] |= 1 << (root & 7)
+
+    def __contains__(self, i):
+        return self.visited[i >> 3] >> (i & 7) & 1 == 1
+
+    def set_direction(self, i, d):
+        # Marca i como visitada, alcanzada con un paso en la dirección d
+        self.visited[i >> 3] |= 1 << (i & 7)
+        k = (i & 3) << 1
+        self.dirs[i >> 2] = self.dirs[i >> 2] & ~(3 << k) | d << k
+
+    def direction(self, i):
+        return self.dirs[i >> 2] >> ((i & 3) << 1) & 3
+
+    def __setitem__(self, child, parent):
+        self.set_direction(child, self._dir_of[child - parent])
+
+    def __getitem__(self, i):
+        if i not in self:
+            raise KeyError(i)
+        return self.get(i)
+
+    def get(self, i, default=None):
+        if i == self.root or i not in self:
+            return default
+        return i - self.offsets[self.direction(i)]
+
+    def path(self, goal):
+        # Camino desde la raíz (excluida) hasta goal, o [] si no se alcanzó
+        if goal not in self:
+            return []
+        offsets, dirs, root = self.offsets, self.dirs, self.root
+        path = []
+        current = goal
+        while current != root:
+            path.append(current)
+            current -= offsets[dirs[current >> 2] >> ((current & 3) << 1) & 3]
+        path.reverse()
+        return path
+
+    def nbytes(self):
+        return len(self.visited) + len(self.dirs)
@@ -0,0 +1,73 @@
+import time
+
+# Planificador cooperativo para la GUI: avanza generadores (búsquedas paso a
+# paso, animación del agente) dentro de un presupuesto de tiempo por cuadro,
+# de modo que el bucle de eventos nunca se bloquea. Cada tarea tiene un
+# intervalo mínimo entre pasos (la velocidad de la animación); con intervalo
+# 0 avanza todo lo que quepa en el presupuesto del cuadro.
+
+# Si un cuadro se atrasa mucho, no se intenta recuperar más de esto de golpe
+MAX_ATRASO = 0.25
+
+
+class Task:
+    __slots__ = ('gen', 'interval', 'on_done', 'next_time', 'busy', 'result', 'done')
+
+    def __init__(self, gen, interval, on_done):
+        self.gen = gen
+        self.interval = interval
+        self.on_done = on_done
+        self.next_time = time.perf_counter()
+        self.busy = 0.0      # segundos gastados dentro del generador
+        self.result = None
+        self.done = False
+
+
+class Scheduler:
+    def __init__(self):
+        self.tasks = []
+
+    def spawn(self, gen, interval=0.0, on_done=None):
+        task = Task(gen, interval, on_done)
+        self.tasks.append(task)
+        return task
+
+    def cancel(self, task):
+        if task in self.tasks:
+            self.tasks.remove(task)
+            task.gen.close()
+
+    def cancel_all(self):
+        for task in list(self.tasks):
+            self.cancel(task)
+
+    @property
+    def busy(self):
+        return bool(self.tasks)
+
+    def run(self, budget):
+        # Avanza las tareas que ya tocan hasta agotar `budget` segundos
+        limite = time.perf_counter() + budget
+        while self.tasks:
+            progreso = False
+            for task in list(self.tasks):
+                ahora = time.perf_counter()
+                if ahora >= limite:
+                    return
+                if ahora < task.next_time:
+                    continue
+                try:
+                    next(task.gen)
+                except StopIteration as fin:
+                    task.result = fin.value
+                    task.done = True
+                    self.tasks.remove(task)
+                task.busy += time.perf_counter() - ahora
+                progreso = True
+                if task.done:
+                    if task.on_done is not None:
+                        task.on_done(task)
+                elif task.interval:
+                    task.next_time = max(task.next_time + task.interval, ahora - MAX_ATRASO)
+            if not progreso:
+                return
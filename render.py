@@ -0,0 +1,38 @@
+import functools
+
+import pygame
+
+# Utilidades de dibujo para la GUI: fuentes y textos renderizados se guardan
+# en caché (crear una SysFont o renderizar un texto en cada cuadro es caro), y
+# las zonas modificadas se acumulan como rectángulos sucios para actualizar
+# solo esas partes de la ventana con pygame.display.update(rects).
+
+# Más allá de esta cantidad sale más barato actualizar el rectángulo que las
+# contiene a todas que pasarle una lista larguísima a display.update
+MAX_RECTS = 256
+
+_sucios = []
+
+
+@functools.lru_cache(maxsize=None)
+def font(name, size):
+    return pygame.font.SysFont(name, size)
+
+
+@functools.lru_cache(maxsize=1024)
+def text(texto, size=17, color=(0, 0, 0), name="Comic Sans"):
+    return font(name, size).render(texto, True, color)
+
+
+def mark(rect):
+    _sucios.append(pygame.Rect(rect))
+
+
+def flush():
+    if not _sucios:
+        return
+    if len(_sucios) > MAX_RECTS:
+        pygame.display.update(_sucios[0].unionall(_sucios[1:]))
+    else:
+        pygame.display.update(_sucios)
+    _sucios.clear()
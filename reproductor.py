@@ -0,0 +1,164 @@
+import argparse
+import sys
+
+import pygame
+
+import render
+import traza
+from grid import EMPTY, OBSTACLE, START, GOAL
+
+# Reproductor de trazas (traza.py): muestra una o dos búsquedas ya grabadas,
+# lado a lado y sincronizadas por número de expansiones, sin volver a
+# correrlas. Solo se redibujan las celdas cuyo estado cambia.
+#
+#   python reproductor.py astar.trz bfs.trz
+#
+# Espacio: pausa, +/-: velocidad, flechas: un paso (con Shift, 10%),
+# Inicio/Fin: saltar al principio o al final, click en la barra: saltar ahí.
+
+ANCHO_PANEL = 600
+ALTO_BARRA = 60
+VELOCIDAD_INICIAL = 20.0   # expansiones por segundo
+FPS = 30
+
+COLORS = {
+    EMPTY: (255, 255, 255),
+    OBSTACLE: (183, 194, 194),
+    START: (102, 248, 12),
+    GOAL: (243, 183, 22),
+    'path': (255, 255, 0),
+}
+
+# Aparte de COLORS: los estados de la repetición comparten valores con las
+# celdas (VISITADA == OBSTACLE, EXPANDIDA == START)
+ESTADO_COLORS = {
+    traza.VISITADA: (100, 149, 237),
+    traza.EXPANDIDA: (65, 105, 225),
+}
+
+
+class Panel:
+    def __init__(self, trace, x):
+        self.trace = trace
+        self.replay = traza.Replay(trace)
+        self.x = x
+        self.tile = max(1, min(ANCHO_PANEL // trace.cols, ANCHO_PANEL // trace.rows))
+        self.camino = set(trace.path)
+
+    def draw_cell(self, screen, i, estado):
+        cell = self.trace.cells[i]
+        if cell in (START, GOAL) or i in (self.trace.start, self.trace.goal):
+            color = COLORS[START if i == self.trace.start else GOAL]
+        elif self.replay.done and i in self.camino:
+            color = COLORS['path']
+        elif estado != traza.NADA:
+            color = ESTADO_COLORS[estado]
+        else:
+            color = COLORS[cell if cell == OBSTACLE else EMPTY]
+        r, c = divmod(i, self.trace.cols)
+        rect = (self.x + c * self.tile, r * self.tile, self.tile, self.tile)
+        pygame.draw.rect(screen, color, rect)
+        if self.tile >= 8:
+            pygame.draw.rect(screen, (79, 93, 98), rect, 1)
+        render.mark(rect)
+
+    def draw_all(self, screen):
+        k = self.replay.cursor
+        for i in range(len(self.trace.cells)):
+            self.draw_cell(screen, i, self.trace.state(i, k))
+
+    def seek_expansion(self, screen, n):
+        terminado = self.replay.done
+        for i, estado in self.replay.seek_expansion(n):
+            self.draw_cell(screen, i, estado)
+        if terminado != self.replay.done:
+            # El camino aparece (o desaparece) al llegar al final
+            for i in self.camino:
+                self.draw_cell(screen, i, self.trace.state(i, self.replay.cursor))
+
+
+def draw_bar(screen, paneles, n, total, velocidad, pausa):
+    alto = max(p.trace.rows * p.tile for p in paneles)
+    ancho = ANCHO_PANEL * len(paneles)
+    barra = (0, alto, ancho, ALTO_BARRA)
+    pygame.draw.rect(screen, (192, 227, 237), barra)
+    progreso = n / total if total else 1
+    pygame.draw.rect(screen, (100, 149, 237), (0, alto, round(ancho * progreso), 8))
+    for p in paneles:
+        st = p.trace.stats
+        texto = (f"{p.trace.algorithm}: {p.replay.expanded()}/{st['expanded']} "
+                 f"expandidos, costo {st['path_cost']}")
+        screen.blit(render.text(texto), (p.x + 10, alto + 12))
+    estado = 'pausa' if pausa else f'{velocidad:g} exp/s'
+    screen.blit(render.text(f'Expansión {n}/{total}  ({estado})'), (10, alto + 34))
+    render.mark(barra)
+    return alto
+
+
+def show(trazas):
+    # Abre la ventana y reproduce una o dos trazas (traza.Trace) hasta cerrarla
+    pygame.init()
+    paneles = [Panel(t, k * ANCHO_PANEL) for k, t in enumerate(trazas)]
+    alto = max(p.trace.rows * p.tile for p in paneles)
+    screen = pygame.display.set_mode((ANCHO_PANEL * len(paneles), alto + ALTO_BARRA))
+    pygame.display.set_caption('Reproductor de trazas')
+    for p in paneles:
+        p.draw_all(screen)
+
+    total = max(len(p.replay.expansiones) for p in paneles)
+    n = 0.0
+    velocidad = VELOCIDAD_INICIAL
+    pausa = False
+    reloj = pygame.time.Clock()
+    running = True
+    while running:
+        dt = reloj.tick(FPS) / 1000
+        destino = n
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                x, y = event.pos
+                if y >= alto:
+                    destino = x / (ANCHO_PANEL * len(paneles)) * total
+            elif event.type == pygame.KEYDOWN:
+                salto = total / 10 if event.mod & pygame.KMOD_SHIFT else 1
+                if event.key == pygame.K_SPACE:
+                    pausa = not pausa
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    velocidad *= 2
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    velocidad = max(velocidad / 2, 0.25)
+                elif event.key == pygame.K_RIGHT:
+                    destino = int(n) + salto
+                elif event.key == pygame.K_LEFT:
+                    destino = int(n) - salto
+                elif event.key == pygame.K_HOME:
+                    destino = 0
+                elif event.key == pygame.K_END:
+                    destino = total
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+        if destino == n and not pausa:
+            destino = n + velocidad * dt
+        n = max(0.0, min(destino, float(total)))
+        for p in paneles:
+            p.seek_expansion(screen, int(n))
+        draw_bar(screen, paneles, int(n), total, velocidad, pausa)
+        render.flush()
+
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reproduce y compara trazas de búsqueda.')
+    parser.add_argument('trazas', nargs='+', help='una o dos trazas grabadas con traza.py')
+    args = parser.parse_args(argv)
+    if len(args.trazas) > 2:
+        parser.error('se comparan a lo sumo dos trazas')
+    show([traza.load(nombre) for nombre in args.trazas])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
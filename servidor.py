@@ -0,0 +1,492 @@
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import random
+import socket
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import estrategias
+from benchmark import percentile
+from binario import load_maze
+from grid import EMPTY, GOAL, MAX_COST, OBSTACLE, START
+
+# Servicio local de búsqueda: un servidor asyncio de larga vida que mantiene
+# los laberintos cargados en memoria y atiende a otros procesos por un socket
+# Unix o TCP en localhost, con un objeto JSON por línea. Así no se paga el
+# arranque ni la carga del mapa en cada consulta.
+#
+#   python servidor.py --maze default=maze_config.json --port 8765
+#   python servidor.py --maze grande=mapa.lab --unix /tmp/laberintos.sock
+#
+# Cada petición es {"op": ..., "id": ...}; la respuesta repite el "id" y trae
+# "ok" (y "error" si falló). Las respuestas de una misma conexión pueden
+# llegar en otro orden que las peticiones: el "id" las empareja.
+#   load      {"maze", "file"}                  carga (o recarga) un laberinto
+#   mazes     {}                                laberintos cargados
+#   toggle    {"maze", "cell"}                  obstáculo <-> libre (clic izquierdo)
+#   cost      {"maze", "cell", "cost"}          costo de terreno (clic derecho)
+#   start     {"maze", "cell"}                  mueve el inicio (tecla S)
+#   goal      {"maze", "cell"}                  mueve la meta (tecla G)
+#   move_goal {"maze", "seed"?}                 meta en una celda al azar (tecla M)
+#   solve     {"maze", "algorithm"?, "start"?, "goal"?, "path"?}
+#   stats     {}                                contadores de latencia y rendimiento
+# "maze" es opcional si solo hay uno cargado.
+#
+# Cada edición sube la versión del laberinto. Las consultas que llegan juntas
+# (dentro de `batch_window`) sobre la misma versión se agrupan en un lote que
+# viaja al pool de procesos como un solo trabajo: la grilla se serializa una
+# vez por versión, las consultas repetidas se resuelven una vez, y cada proceso
+# guarda la última versión que recibió de cada laberinto junto con lo que las
+# estrategias precalculan sobre él (HPA*, D* Lite, campos de distancia). Una
+# edición despacha antes el lote pendiente, que sale con la versión vieja.
+
+BATCH_WINDOW = 0.002   # segundos que un lote espera más consultas
+MAX_BATCH = 64         # consultas por lote como máximo
+LATENCIAS = 10_000     # latencias recientes que se guardan para los percentiles
+
+
+class MazeState:
+    __slots__ = ('name', 'grid', 'start', 'goal', 'version', '_snapshot')
+
+    def __init__(self, name, grid, start, goal):
+        self.name = name
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.version = 0
+        self._snapshot = None   # (versión, grilla serializada)
+
+    def snapshot(self):
+        # Grilla serializada de la versión actual; toda edición pasa por el
+        # servidor y sube la versión, así que se serializa una vez por versión
+        if self._snapshot is None or self._snapshot[0] != self.version:
+            self._snapshot = (self.version, pickle.dumps(self.grid))
+        return self._snapshot[1]
+
+    def info(self):
+        return {'maze': self.name, 'rows': self.grid.rows, 'cols': self.grid.cols,
+                'start': list(self.start), 'goal': list(self.goal), 'version': self.version}
+
+
+class ServerStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.by_op = {}
+        self.queries = 0          # consultas solve respondidas
+        self.batches = 0          # lotes enviados al pool
+        self.solved = 0           # búsquedas que de verdad se ejecutaron
+        self.deduplicated = 0     # consultas iguales a otra del mismo lote
+        self.max_batch = 0
+        self.in_flight = 0        # consultas esperando respuesta
+        self.connections = 0
+        self.latencies = deque(maxlen=LATENCIAS)   # segundos por consulta solve
+        self.search_time = 0.0    # segundos dentro de las búsquedas (suma)
+
+    def as_dict(self):
+        uptime = time.perf_counter() - self.started
+        latencias = list(self.latencies)
+        ms = {}
+        if latencias:
+            ms = {'median': percentile(latencias, 50) * 1e3, 'p90': percentile(latencias, 90) * 1e3,
+                  'p99': percentile(latencias, 99) * 1e3, 'max': max(latencias) * 1e3}
+        return {
+            'uptime_s': uptime,
+            'requests': self.requests,
+            'errors': self.errors,
+            'by_op': dict(self.by_op),
+            'connections': self.connections,
+            'queries': self.queries,
+            'queries_per_s': self.queries / uptime if uptime else 0.0,
+            'in_flight': self.in_flight,
+            'batches': self.batches,
+            'mean_batch': self.solved / self.batches if self.batches else 0.0,
+            'max_batch': self.max_batch,
+            'deduplicated': self.deduplicated,
+            'search_s': self.search_time,
+            'latency_ms': ms,
+        }
+
+
+# --- Del lado de los procesos del pool ---
+_MAZES = {}   # nombre -> (versión, Grid) de la última versión recibida
+
+
+def _solve_batch(name, version, datos, consultas, cache=True):
+    # consultas: lista de (inicio, meta, algoritmo) distintas. Devuelve una
+    # lista paralela de resultados
+    guardado = _MAZES.get(name) if cache else None
+    if guardado is not None and guardado[0] == version:
+        grid = guardado[1]
+    else:
+        grid = pickle.loads(datos)
+        if cache:
+            _MAZES[name] = (version, grid)
+    resultados = []
+    for start, goal, algorithm in consultas:
+        path, stats = estrategias.solve(grid, start, goal, algorithm)
+        resultados.append({
+            'found': bool(path),
+            'cost': grid.path_cost(path),
+            'path': [list(p) for p in path],
+            'stats': stats.as_dict(),
+        })
+    return resultados
+
+
+class _Batch:
+    __slots__ = ('maze', 'version', 'pending', 'timer')
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.version = maze.version
+        self.pending = {}   # (inicio, meta, algoritmo) -> [futuros]
+        self.timer = None
+
+
+class RequestError(Exception):
+    pass
+
+
+class PathServer:
+    def __init__(self, workers=None, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.mazes = {}
+        self.stats = ServerStats()
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        # Con workers=0 las búsquedas corren en un hilo aparte (sin paralelismo
+        # real, pero sin procesos); útil para depurar o donde no hay fork
+        self.inline = workers == 0
+        self.pool = ThreadPoolExecutor(1) if self.inline else ProcessPoolExecutor(workers)
+        self._batches = {}   # nombre -> _Batch abierto
+        self._tasks = set()
+        self._ops = {
+            'load': self.op_load, 'mazes': self.op_mazes, 'toggle': self.op_toggle,
+            'cost': self.op_cost, 'start': self.op_start, 'goal': self.op_goal,
+            'move_goal': self.op_move_goal, 'solve': self.op_solve, 'stats': self.op_stats,
+        }
+
+    def add_maze(self, name, grid, start, goal):
+        self._dispatch(name)
+        self.mazes[name] = MazeState(name, grid, start, goal)
+        return self.mazes[name]
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    # --- Conexiones ---
+    async def handle(self, reader, writer):
+        self.stats.connections += 1
+        tareas = set()
+        escritura = asyncio.Lock()
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                # Cada petición en su propia tarea: las consultas de una misma
+                # conexión también se agrupan entre sí
+                tarea = asyncio.create_task(self._answer(linea, writer, escritura))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # el cliente se fue, o mandó una línea demasiado larga
+        finally:
+            self.stats.connections -= 1
+            writer.close()
+
+    async def _answer(self, linea, writer, escritura):
+        respuesta = await self.request(linea)
+        async with escritura:
+            if writer.is_closing():
+                return
+            writer.write(json.dumps(respuesta).encode() + b'\n')
+            await writer.drain()
+
+    async def request(self, linea):
+        # Una línea JSON -> diccionario de respuesta (nunca lanza)
+        self.stats.requests += 1
+        id_ = None
+        try:
+            try:
+                mensaje = json.loads(linea)
+            except ValueError as error:
+                raise RequestError(f'JSON inválido: {error}') from None
+            if not isinstance(mensaje, dict):
+                raise RequestError('cada línea debe ser un objeto JSON')
+            id_ = mensaje.get('id')
+            op = mensaje.get('op')
+            if op not in self._ops:
+                raise RequestError(f'Operación desconocida: {op!r} '
+                                   f'(opciones: {", ".join(self._ops)})')
+            self.stats.by_op[op] = self.stats.by_op.get(op, 0) + 1
+            respuesta = await self._ops[op](mensaje)
+        except (RequestError, KeyError, ValueError, IndexError, TypeError, OSError) as error:
+            self.stats.errors += 1
+            return {'id': id_, 'ok': False, 'error': str(error)}
+        return {'id': id_, 'ok': True, **respuesta}
+
+    # --- Validación ---
+    def _maze(self, mensaje):
+        name = mensaje.get('maze')
+        if name is None and len(self.mazes) == 1:
+            name = next(iter(self.mazes))
+        if name not in self.mazes:
+            raise RequestError(f'Laberinto desconocido: {name!r} '
+                               f'(cargados: {", ".join(self.mazes) or "ninguno"})')
+        return self.mazes[name]
+
+    def _cell(self, maze, mensaje, campo='cell', default=None):
+        valor = mensaje.get(campo)
+        if valor is None:
+            if default is None:
+                raise RequestError(f'Falta "{campo}"')
+            return default
+        if not (isinstance(valor, list) and len(valor) == 2
+                and all(isinstance(x, int) for x in valor)):
+            raise RequestError(f'"{campo}" debe ser [fila, columna]: {valor!r}')
+        pos = tuple(valor)
+        if not maze.grid.in_bounds(pos):
+            raise RequestError(f'{campo} {list(pos)} fuera del laberinto de '
+                               f'{maze.grid.rows}x{maze.grid.cols}')
+        return pos
+
+    # --- Ediciones: las mismas reglas que los clics y teclas de agente2 ---
+    def _edited(self, maze):
+        maze.version += 1
+        return {'maze': maze.name, 'version': maze.version}
+
+    async def op_load(self, mensaje):
+        name = mensaje.get('maze', 'default')
+        if not isinstance(mensaje.get('file'), str):
+            raise RequestError('Falta "file"')
+        grid, start, goal = await asyncio.to_thread(load_maze, mensaje['file'])
+        viejo = self.mazes.get(name)
+        maze = self.add_maze(name, grid, start, goal)
+        if viejo is not None:
+            maze.version = viejo.version + 1  # que nadie confunda la recarga con lo anterior
+        return maze.info()
+
+    async def op_mazes(self, mensaje):
+        return {'mazes': [maze.info() for maze in self.mazes.values()]}
+
+    async def op_toggle(self, mensaje):
+        maze = self._maze(mensaje)
+        pos = self._cell(maze, mensaje)
+        if pos in (maze.start, maze.goal):
+            raise RequestError(f'{list(pos)} es el inicio o la meta')
+        self._dispatch(maze.name)
+        maze.grid.set_cell(pos, OBSTACLE if maze.grid.cell(pos) == EMPTY else EMPTY)
+        return {**self._edited(maze), 'cell': list(pos), 'value': maze.grid.cell(pos)}
+
+    async def op_cost(self, mensaje):
+        maze = self._maze(mensaje)
+        pos = self._cell(maze, mensaje)
+        costo = mensaje.get('cost')
+        if not isinstance(costo, int) or not 1 <= costo <= MAX_COST:
+            raise RequestError(f'"cost" debe ser un entero entre 1 y {MAX_COST}: {costo!r}')
+        self._dispatch(maze.name)
+        maze.grid.set_cost(pos, costo)
+        return {**self._edited(maze), 'cell': list(pos), 'cost': costo}
+
+    def _move(self, maze, pos, cual):
+        self._dispatch(maze.name)
+        grid = maze.grid
+        if cual == 'start':
+            grid.set_cell(maze.start, EMPTY)
+            maze.start = pos
+            grid.set_cell(pos, START)
+        else:
+            grid.set_cell(maze.goal, EMPTY)
+            maze.goal = pos
+            grid.set_cell(pos, GOAL)
+        return {**self._edited(maze), 'start': list(maze.start), 'goal': list(maze.goal)}
+
+    async def op_start(self, mensaje):
+        maze = self._maze(mensaje)
+        pos = self._cell(maze, mensaje)
+        if pos == maze.goal:
+            raise RequestError(f'{list(pos)} es la meta')
+        return self._move(maze, pos, 'start')
+
+    async def op_goal(self, mensaje):
+        maze = self._maze(mensaje)
+        pos = self._cell(maze, mensaje)
+        if pos == maze.start:
+            raise RequestError(f'{list(pos)} es el inicio')
+        return self._move(maze, pos, 'goal')
+
+    async def op_move_goal(self, mensaje):
+        maze = self._maze(mensaje)
+        rng = random.Random(mensaje.get('seed'))
+        grid = maze.grid
+        pos = maze.start
+        while pos == maze.start and len(grid) > 1:
+            pos = (rng.randrange(grid.rows), rng.randrange(grid.cols))
+        return self._move(maze, pos, 'goal')
+
+    async def op_stats(self, mensaje):
+        return {'stats': self.stats.as_dict(),
+                'mazes': {name: maze.version for name, maze in self.mazes.items()}}
+
+    # --- Consultas agrupadas en lotes ---
+    async def op_solve(self, mensaje):
+        inicio = time.perf_counter()
+        maze = self._maze(mensaje)
+        algorithm = mensaje.get('algorithm', 'astar')
+        if algorithm not in estrategias.STRATEGIES:
+            raise RequestError(f'Estrategia desconocida: {algorithm!r} '
+                               f'(opciones: {", ".join(estrategias.STRATEGIES)})')
+        start = self._cell(maze, mensaje, 'start', maze.start)
+        goal = self._cell(maze, mensaje, 'goal', maze.goal)
+        version = maze.version
+
+        lote = self._batches.get(maze.name)
+        if lote is None:
+            lote = self._batches[maze.name] = _Batch(maze)
+            lote.timer = asyncio.get_running_loop().call_later(
+                self.batch_window, self._dispatch, maze.name)
+        futuro = asyncio.get_running_loop().create_future()
+        futuros = lote.pending.setdefault((start, goal, algorithm), [])
+        if futuros:
+            self.stats.deduplicated += 1
+        futuros.append(futuro)
+        if len(lote.pending) >= self.max_batch:
+            self._dispatch(maze.name)
+
+        self.stats.in_flight += 1
+        try:
+            resultado = await futuro
+        finally:
+            self.stats.in_flight -= 1
+        self.stats.queries += 1
+        self.stats.latencies.append(time.perf_counter() - inicio)
+        if not mensaje.get('path', True):
+            resultado = {k: v for k, v in resultado.items() if k != 'path'}
+        return {'maze': maze.name, 'version': version, 'algorithm': algorithm,
+                'start': list(start), 'goal': list(goal), **resultado}
+
+    def _dispatch(self, name):
+        # Envía al pool el lote abierto de `name`, si lo hay. Se llama desde el
+        # temporizador, al llenarse el lote y antes de cada edición, así que la
+        # versión del laberinto todavía es la del lote
+        lote = self._batches.pop(name, None)
+        if lote is None:
+            return
+        lote.timer.cancel()
+        consultas = list(lote.pending)
+        datos = lote.maze.snapshot()
+        self.stats.batches += 1
+        self.stats.solved += len(consultas)
+        if len(consultas) > self.stats.max_batch:
+            self.stats.max_batch = len(consultas)
+        loop = asyncio.get_running_loop()
+        trabajo = loop.run_in_executor(self.pool, _solve_batch, name, lote.version, datos,
+                                       consultas, not self.inline)
+        tarea = asyncio.ensure_future(self._deliver(lote, consultas, trabajo))
+        self._tasks.add(tarea)
+        tarea.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, lote, consultas, trabajo):
+        try:
+            resultados = await trabajo
+        except Exception as error:  # el error de la búsqueda llega a cada consulta del lote
+            for futuros in lote.pending.values():
+                for futuro in futuros:
+                    if not futuro.done():
+                        futuro.set_exception(RequestError(f'Error en la búsqueda: {error}'))
+            return
+        for consulta, resultado in zip(consultas, resultados):
+            self.stats.search_time += resultado['stats']['elapsed']
+            for futuro in lote.pending[consulta]:
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+
+async def serve(server, host='127.0.0.1', port=8765, unix=None):
+    if unix is not None:
+        escucha = await asyncio.start_unix_server(server.handle, unix)
+        donde = unix
+    else:
+        escucha = await asyncio.start_server(server.handle, host, port)
+        donde = '{}:{}'.format(*escucha.sockets[0].getsockname()[:2])
+    print(f'Escuchando en {donde} con {len(server.mazes)} laberinto(s): '
+          f'{", ".join(server.mazes)}', file=sys.stderr)
+    async with escucha:
+        await escucha.serve_forever()
+
+
+# --- Cliente bloqueante para otros procesos ---
+class Client:
+    def __init__(self, host='127.0.0.1', port=8765, unix=None):
+        if unix is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(unix)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.file = self.sock.makefile('rwb')
+        self._id = 0
+
+    def call(self, op, **campos):
+        # Una petición y su respuesta; lanza RuntimeError si el servidor la rechaza
+        self._id += 1
+        self.file.write(json.dumps({'op': op, 'id': self._id, **campos}).encode() + b'\n')
+        self.file.flush()
+        respuesta = json.loads(self.file.readline())
+        if not respuesta['ok']:
+            raise RuntimeError(respuesta['error'])
+        return respuesta
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor local de búsqueda de caminos.')
+    parser.add_argument('--maze', action='append', metavar='NOMBRE=ARCHIVO',
+                        help='laberinto a cargar al iniciar (se puede repetir; '
+                             'por defecto default=maze_config.json)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='ruta de un socket Unix (en vez de TCP)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='procesos del pool (0: un hilo, sin procesos)')
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW * 1e3,
+                        help='milisegundos que un lote espera más consultas')
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    server = PathServer(args.workers, args.batch_window / 1e3, args.max_batch)
+    try:
+        for item in args.maze or ['default=maze_config.json']:
+            name, sep, filename = item.partition('=')
+            if not sep:
+                name, filename = os.path.splitext(os.path.basename(item))[0], item
+            server.add_maze(name, *load_maze(filename))
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import time
+
+_INICIO = time.perf_counter()  # antes de los demás imports, para medirlos
+
+import argparse
+import json
+import sys
+
+import estrategias
+import traza
+from binario import load_maze
+
+# Línea de comandos sin interfaz gráfica: carga solo el núcleo de búsqueda
+# (nada de pygame ni matplotlib) y resuelve un laberinto.
+#
+#   python solve.py --config maze_config.json --algo astar
+#   python solve.py --config maze.lab --algo bfs --start 0 0 --goal 9 9 --json
+#   python solve.py --config maze_config.json --algo astar --visual
+#
+# --visual graba la traza y la muestra en reproductor.py, que recién entonces
+# importa pygame. Al final se informa el arranque en frío en la salida de
+# errores: tiempo de CPU del proceso hasta tener el núcleo listo (incluye
+# iniciar el intérprete) y cuánto de eso fueron los imports del núcleo.
+
+MODULOS_GRAFICOS = ('pygame', 'matplotlib')
+
+
+def startup():
+    # (CPU desde que arrancó el proceso, segundos de imports del núcleo)
+    return time.process_time(), time.perf_counter() - _INICIO
+
+
+def graficos_cargados():
+    return [m for m in MODULOS_GRAFICOS if m in sys.modules]
+
+
+def main(argv=None):
+    arranque, imports = startup()
+    parser = argparse.ArgumentParser(description='Resuelve un laberinto sin interfaz gráfica.')
+    parser.add_argument('--config', default='maze_config.json',
+                        help='laberinto (JSON o binario)')
+    parser.add_argument('--algo', default='astar', choices=list(estrategias.STRATEGIES))
+    parser.add_argument('--start', type=int, nargs=2, metavar=('FILA', 'COL'))
+    parser.add_argument('--goal', type=int, nargs=2, metavar=('FILA', 'COL'))
+    parser.add_argument('--json', action='store_true', help='resultado como un objeto JSON')
+    parser.add_argument('--trace', help='guarda la traza de la búsqueda en este archivo')
+    parser.add_argument('--visual', action='store_true',
+                        help='muestra la búsqueda en el reproductor (importa pygame)')
+    args = parser.parse_args(argv)
+
+    grid, start, goal = load_maze(args.config)
+    start = tuple(args.start) if args.start else start
+    goal = tuple(args.goal) if args.goal else goal
+    for nombre, pos in (('inicio', start), ('meta', goal)):
+        if not grid.in_bounds(pos):
+            parser.error(f'{nombre} {pos} fuera del laberinto de {grid.rows}x{grid.cols}')
+
+    if args.trace or args.visual:
+        path, stats, trace = traza.record(grid, start, goal, args.algo)
+        if args.trace:
+            traza.dump(trace, args.trace)
+    else:
+        path, stats = estrategias.solve(grid, start, goal, args.algo)
+
+    if args.json:
+        print(json.dumps({
+            'algorithm': args.algo,
+            'start': list(start),
+            'goal': list(goal),
+            'found': bool(path),
+            'cost': stats.path_cost,
+            'path': [list(p) for p in path],
+            'stats': stats.as_dict(),
+            'startup_s': arranque,
+        }))
+    elif path:
+        print(f'{args.algo}: camino de {len(path)} pasos, costo {stats.path_cost}')
+        print(' '.join(f'{r},{c}' for r, c in path))
+    else:
+        print(f'{args.algo}: no se encontró una ruta de {start} a {goal}')
+    print(f'arranque: {arranque * 1e3:.1f} ms de CPU (imports del núcleo '
+          f'{imports * 1e3:.1f} ms), búsqueda: {stats.elapsed * 1e3:.3f} ms, '
+          f'expandidos: {stats.expanded}', file=sys.stderr)
+    cargados = graficos_cargados()
+    if cargados:
+        print(f'aviso: se cargaron módulos gráficos: {", ".join(cargados)}', file=sys.stderr)
+
+    if args.visual:
+        import reproductor
+        reproductor.show([trace])
+    return 0 if path else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
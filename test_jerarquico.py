@@ -0,0 +1,50 @@
+import random
+
+from grid import EMPTY, OBSTACLE, Grid
+from jerarquico import ClusterGraph
+
+# El grafo de clusters que se actualiza con cada edición del grid tiene que
+# quedar igual al que se armaría de cero sobre el grid ya editado.
+
+
+def _fresco(grid, size):
+    nuevo = ClusterGraph(grid, size)
+    nuevo._refresh()
+    nuevo.close()
+    return nuevo
+
+
+def test_costo_de_transicion_en_el_borde():
+    grid = Grid(4, 40)
+    grafo = ClusterGraph(grid, 16)
+    grafo._refresh()
+    ia, ib = grafo.borders[(0, 1)][0]
+    grid.set_cost(grid.position(ib), 9)
+    grafo._refresh()
+    assert grafo.inter[ia][ib] == 9 == grid.cost(ib)
+
+
+def test_incremental_igual_a_reconstruido():
+    for seed in range(30):
+        rng = random.Random(seed)
+        rows, cols = rng.randint(10, 40), rng.randint(10, 40)
+        grid = Grid.random(rows, cols, 0.2, seed=seed)
+        for _ in range(rows * cols // 4):
+            grid.set_cost((rng.randrange(rows), rng.randrange(cols)), rng.randint(1, 5))
+        grafo = ClusterGraph(grid, 8)
+        grafo._refresh()
+        for _ in range(5):
+            for _ in range(rng.randint(1, 12)):
+                pos = (rng.randrange(rows), rng.randrange(cols))
+                if rng.random() < 0.5:
+                    grid.set_cell(pos, OBSTACLE if grid.cell(pos) == EMPTY else EMPTY)
+                else:
+                    grid.set_cost(pos, rng.randint(1, 9))
+            grafo._refresh()
+            fresco = _fresco(grid, 8)
+            # Un borde sin transiciones puede quedar como lista vacía
+            assert ({k: v for k, v in grafo.borders.items() if v}
+                    == {k: v for k, v in fresco.borders.items() if v}), seed
+            assert grafo.inter == fresco.inter, seed
+            assert grafo.intra == fresco.intra, seed
+        grafo.close()
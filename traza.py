@@ -0,0 +1,261 @@
+import argparse
+import io
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+
+import estrategias
+from binario import load_maze
+from grid import Grid
+
+# Trazas binarias de búsqueda: se corre la búsqueda una sola vez, a toda
+# velocidad, con un observador que anota cada evento 'expand' y 'visit' como
+# un entero de 4 bytes (2 bits de tipo + índice de celda). La traza guarda
+# además las celdas del laberinto, el camino y las estadísticas, así que se
+# puede reproducir después a cualquier velocidad, saltar a cualquier punto y
+# comparar dos corridas lado a lado (reproductor.py) sin volver a buscar.
+#
+#   python traza.py record maze_config.json astar astar.trz
+#   python traza.py info astar.trz bfs.trz
+#
+# Formato: cabecera fija, nombre del algoritmo, estadísticas en JSON, celdas
+# (un byte cada una), costos (solo si el laberinto los tiene), eventos y
+# camino (uint32 little-endian).
+
+MAGIC = b'TRZ1'
+# magia, filas, columnas, inicio, meta, eventos, largo del camino, banderas,
+# largo del nombre, largo de las estadísticas
+CABECERA = struct.Struct('<4s9I')
+CON_COSTOS = 1
+
+EXPAND, VISIT = 0, 1
+_TIPO = 30                       # los 2 bits altos guardan el tipo de evento
+_INDICE = (1 << _TIPO) - 1
+_EVENTOS = {'expand': EXPAND, 'visit': VISIT}
+
+# Estado de una celda durante la reproducción
+NADA, VISITADA, EXPANDIDA = 0, 1, 2
+
+
+class Recorder:
+    # Observador que va llenando una traza; puede envolver otro observador
+    # (por ejemplo el que pinta la GUI) para grabar mientras se anima
+    def __init__(self, grid, inner=None):
+        if len(grid) > _INDICE:
+            raise ValueError(f'Laberinto demasiado grande para una traza: {len(grid)} celdas')
+        self.cols = grid.cols
+        self.events = array('I')
+        self.inner = inner
+
+    def __call__(self, evento, dato):
+        tipo = _EVENTOS.get(evento)
+        if tipo is not None:
+            self.events.append(tipo << _TIPO | dato[0] * self.cols + dato[1])
+        if self.inner is not None:
+            self.inner(evento, dato)
+
+    def trace(self, grid, start, goal, algorithm, path, stats):
+        return Trace(grid.rows, grid.cols, bytes(grid.cells),
+                     None if grid.costs is None else bytes(grid.costs),
+                     grid.index(start), grid.index(goal), algorithm,
+                     stats.as_dict(), self.events,
+                     array('I', (grid.index(p) for p in path)))
+
+
+class Trace:
+    def __init__(self, rows, cols, cells, costs, start, goal, algorithm, stats,
+                 events, path):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.costs = costs
+        self.start = start
+        self.goal = goal
+        self.algorithm = algorithm
+        self.stats = stats
+        self.events = events
+        self.path = path
+        self._primeras = None
+
+    def __len__(self):
+        return len(self.events)
+
+    def grid(self):
+        return Grid(self.rows, self.cols, bytearray(self.cells),
+                    costs=None if self.costs is None else bytearray(self.costs))
+
+    def event(self, k):
+        # (tipo, índice de celda) del evento k
+        e = self.events[k]
+        return e >> _TIPO, e & _INDICE
+
+    def _first_times(self):
+        # Para cada celda, el número del primer evento que la visitó y el del
+        # primero que la expandió (len(self) si nunca ocurre). Con eso el
+        # estado de cualquier celda en cualquier punto es una comparación.
+        if self._primeras is None:
+            n, total = self.rows * self.cols, len(self.events)
+            visita = array('I', [total]) * n
+            expansion = array('I', [total]) * n
+            for k, e in enumerate(self.events):
+                i = e & _INDICE
+                destino = expansion if e >> _TIPO == EXPAND else visita
+                if destino[i] == total:
+                    destino[i] = k
+            self._primeras = visita, expansion
+        return self._primeras
+
+    def state(self, i, k):
+        # Estado de la celda i después de aplicar los primeros k eventos
+        visita, expansion = self._first_times()
+        if expansion[i] < k:
+            return EXPANDIDA
+        return VISITADA if visita[i] < k else NADA
+
+
+class Replay:
+    # Cursor sobre una traza: avanzar, retroceder o saltar devuelve solo las
+    # celdas cuyo estado cambió, para redibujar únicamente esas
+    def __init__(self, trace):
+        self.trace = trace
+        self.cursor = 0
+        self.expansiones = array('I', (k for k, e in enumerate(trace.events)
+                                       if e >> _TIPO == EXPAND))
+
+    @property
+    def done(self):
+        return self.cursor >= len(self.trace)
+
+    def seek(self, k):
+        k = max(0, min(k, len(self.trace)))
+        a, b = sorted((self.cursor, k))
+        tocadas = {self.trace.events[j] & _INDICE for j in range(a, b)}
+        self.cursor = k
+        return [(i, self.trace.state(i, k)) for i in tocadas]
+
+    def advance(self, n):
+        return self.seek(self.cursor + n)
+
+    def seek_fraction(self, fraccion):
+        return self.seek(round(fraccion * len(self.trace)))
+
+    def seek_expansion(self, n):
+        # Salta a justo después de la n-ésima expansión y sus vecinos; así dos
+        # trazas se pueden comparar con el mismo número de expansiones
+        return self.seek(self.expansiones[n] if n < len(self.expansiones) else len(self.trace))
+
+    def expanded(self):
+        # Expansiones ya reproducidas
+        return bisect_right(self.expansiones, self.cursor - 1)
+
+
+def record(grid, start, goal, algorithm='astar'):
+    # Corre la búsqueda una vez y devuelve (camino, estadisticas, traza)
+    recorder = Recorder(grid)
+    path, stats = estrategias.solve(grid, start, goal, algorithm, recorder)
+    return path, stats, recorder.trace(grid, start, goal, algorithm, path, stats)
+
+
+def dump(trace, destino):
+    # destino: nombre de archivo o cualquier objeto con write (io.BytesIO)
+    if not hasattr(destino, 'write'):
+        with open(destino, 'wb') as file:
+            return dump(trace, file)
+    nombre = trace.algorithm.encode()
+    stats = json.dumps(trace.stats).encode()
+    destino.write(CABECERA.pack(
+        MAGIC, trace.rows, trace.cols, trace.start, trace.goal, len(trace.events),
+        len(trace.path), CON_COSTOS if trace.costs is not None else 0,
+        len(nombre), len(stats)))
+    destino.write(nombre)
+    destino.write(stats)
+    destino.write(trace.cells)
+    if trace.costs is not None:
+        destino.write(trace.costs)
+    for valores in (trace.events, trace.path):
+        if sys.byteorder == 'big':
+            valores = array('I', valores)
+            valores.byteswap()
+        destino.write(valores.tobytes())
+
+
+def dumps(trace):
+    buffer = io.BytesIO()
+    dump(trace, buffer)
+    return buffer.getvalue()
+
+
+def load(origen):
+    if not hasattr(origen, 'read'):
+        with open(origen, 'rb') as file:
+            return load(file)
+
+    def leer(n):
+        datos = origen.read(n)
+        if len(datos) != n:
+            raise ValueError('traza truncada')
+        return datos
+
+    magic, rows, cols, start, goal, n_eventos, n_camino, banderas, n_nombre, n_stats = \
+        CABECERA.unpack(leer(CABECERA.size))
+    if magic != MAGIC:
+        raise ValueError('no es una traza de búsqueda')
+    algorithm = leer(n_nombre).decode()
+    stats = json.loads(leer(n_stats))
+    cells = leer(rows * cols)
+    costs = leer(rows * cols) if banderas & CON_COSTOS else None
+    valores = []
+    for n in (n_eventos, n_camino):
+        datos = array('I')
+        datos.frombytes(leer(n * datos.itemsize))
+        if sys.byteorder == 'big':
+            datos.byteswap()
+        valores.append(datos)
+    return Trace(rows, cols, cells, costs, start, goal, algorithm, stats, *valores)
+
+
+def loads(datos):
+    return load(io.BytesIO(datos))
+
+
+def compare(trazas):
+    # Tabla de texto con las estadísticas de varias trazas, una columna cada una
+    campos = ('expanded', 'generated', 'pushes', 'pops', 'max_frontier',
+              'path_length', 'path_cost', 'elapsed')
+    lineas = [f"{'':>14}" + ''.join(f'{t.algorithm:>16}' for t in trazas),
+              f"{'events':>14}" + ''.join(f'{len(t):>16}' for t in trazas)]
+    for campo in campos:
+        valores = [t.stats.get(campo) for t in trazas]
+        if campo == 'elapsed':
+            lineas.append(f"{'elapsed_ms':>14}" + ''.join(f'{v * 1e3:>16.3f}' for v in valores))
+        else:
+            lineas.append(f'{campo:>14}' + ''.join(f'{v:>16}' for v in valores))
+    return '\n'.join(lineas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Graba y compara trazas de búsqueda.')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    grabar = sub.add_parser('record', help='corre una búsqueda y guarda su traza')
+    grabar.add_argument('maze', help='laberinto (JSON o binario)')
+    grabar.add_argument('algorithm', choices=list(estrategias.STRATEGIES))
+    grabar.add_argument('salida', help='archivo de traza')
+    info = sub.add_parser('info', help='compara las estadísticas de una o más trazas')
+    info.add_argument('trazas', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.comando == 'record':
+        grid, start, goal = load_maze(args.maze)
+        path, stats, trace = record(grid, start, goal, args.algorithm)
+        dump(trace, args.salida)
+        print(f'{args.salida}: {len(trace)} eventos, camino de {len(path)} pasos',
+              file=sys.stderr)
+    else:
+        print(compare([load(nombre) for nombre in args.trazas]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())